@@ -5,7 +5,9 @@ by bilby_pipe. Injection files can be generated in a variety of formats, see
 below, and are generated from a bilby-style prior_file.
 
 Available formats: A dat file consists of a space-separated list of parameters
-with a header; A json formatted file.
+with a header; A json formatted file; A parquet or feather file, columnar binary
+formats which are faster to read and write for large numbers of injections
+(these require pyarrow).
 
 If a geocent_time prior is given in the file, this will be used to create the
 time prior. Otherwise, the trigger-time & deltaT or gps-time and deltaT options
@@ -13,9 +15,13 @@ are used (see below).
 
 """
 import argparse
+import csv
+import functools
 import json
 import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import pandas as pd
@@ -26,22 +32,41 @@ from .input import Input
 from .utils import (
     BilbyPipeError,
     check_directory_exists_and_if_not_mkdir,
-    get_geocent_time_with_uncertainty,
     logger,
     parse_args,
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+INJECTION_FILE_EXTENSIONS = ["json", "dat", "parquet", "feather"]
+
+# Number of samples drawn per chunk when sampling large injection sets
+PARALLEL_SAMPLING_CHUNK_SIZE = 10000
+
+# The priors held by each sampling worker process
+_worker_priors = None
+
 
 class BilbyPipeCreateInjectionsError(BilbyPipeError):
     def __init__(self, message):
         super().__init__(message)
 
 
-def create_parser():
+def create_parser(fresh=False):
     """Generate a parser for the create_injections.py script
 
-    Additional options can be added to the returned parser before calling
-    `parser.parse_args` to generate the arguments`
+    The parser is built once and the same instance is returned on later
+    calls. Additional options can be added before calling
+    `parser.parse_args` to generate the arguments, but only to a parser
+    created with `fresh=True` so that the shared instance is not modified.
+
+    Parameters
+    ----------
+    fresh: bool
+        If True, build and return a new parser rather than the shared one
 
     Returns
     -------
@@ -49,6 +74,13 @@ def create_parser():
         A parser with all the default options already added
 
     """
+    if fresh:
+        return _build_parser.__wrapped__()
+    return _build_parser()
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser():
     parser = argparse.ArgumentParser(
         prog="bilby_pipe_create_injection_file", description=__doc__
     )
@@ -64,7 +96,7 @@ def create_parser():
         "--extension",
         type=str,
         default="dat",
-        choices=["json", "dat"],
+        choices=INJECTION_FILE_EXTENSIONS,
         help="Prior file format",
     )
     parser.add_arg(
@@ -139,6 +171,18 @@ def create_parser():
         help="The name of the prior set to base the prior on. Can be one of"
         "[PriorDict, BBHPriorDict, BNSPriorDict, CalibrationPriorDict]",
     )
+    parser.add(
+        "--n-processes",
+        default=1,
+        type=int,
+        help=(
+            "The number of processes used to sample the prior. If larger than "
+            f"1 and n-injection > {PARALLEL_SAMPLING_CHUNK_SIZE}, the samples "
+            "are drawn in independently seeded chunks: the output for a given "
+            "generation seed is then the same for any n-processes > 1, but "
+            "differs from the serial draw"
+        ),
+    )
     return parser
 
 
@@ -157,6 +201,7 @@ class InjectionCreator(Input):
         deltaT=0.2,
         duration=4,
         post_trigger_duration=2,
+        n_processes=1,
     ):
         self.prior_file = prior_file
         self.prior_dict = prior_dict
@@ -169,6 +214,7 @@ class InjectionCreator(Input):
         self.post_trigger_duration = post_trigger_duration
         self.n_injection = n_injection
         self.generation_seed = generation_seed
+        self.n_processes = n_processes
         self.time_reference = "geocent"
         self.reference_frame = "sky"
 
@@ -200,38 +246,143 @@ class InjectionCreator(Input):
             )
         self._n_injection = n_injection
 
+    @property
+    def sample_in_chunks(self):
+        """Whether the priors are sampled in chunks over several processes"""
+        return self.n_processes > 1 and self.n_injection > PARALLEL_SAMPLING_CHUNK_SIZE
+
+    def get_injection_samples(self, rng=None):
+        """Samples parameters from the prior into a dictionary of arrays
+
+        Parameters
+        ----------
+        rng: numpy.random.Generator, optional
+            The generator used to draw the geocenter times when a gps_file is
+            given. If None, a generator seeded by the generation_seed is used.
+            Note, the bilby priors draw from the global numpy random state.
+        """
+        if self.sample_in_chunks:
+            samples = self.sample_priors_in_chunks()
+        else:
+            samples = self.priors.sample(self.n_injection)
+        if self.gps_file is not None:
+            if rng is None:
+                rng = np.random.default_rng(self.generation_seed)
+            trigger_times = self.gpstimes + self.duration - self.post_trigger_duration
+            samples["geocenter_times"] = rng.uniform(
+                trigger_times - self.deltaT / 2.0, trigger_times + self.deltaT / 2.0
+            )
+        return samples
+
+    def sample_priors_in_chunks(self):
+        """Samples the priors in independently seeded chunks
+
+        Returns
+        -------
+        samples: dict
+            A dictionary of arrays of n_injection samples
+        """
+        chunks = list(self.iter_prior_chunks())
+        return {
+            key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]
+        }
+
+    def iter_prior_chunks(self):
+        """Yields samples from the priors in independently seeded chunks
+
+        The chunks of PARALLEL_SAMPLING_CHUNK_SIZE samples are seeded from
+        children of a SeedSequence built from the generation_seed and are
+        distributed over n_processes processes. The result therefore depends
+        only on the generation_seed and n_injection. The priors are sent to
+        each worker once, and at most n_processes chunks are sampled ahead of
+        the chunk being consumed.
+
+        Yields
+        ------
+        samples: dict
+            A dictionary of arrays of samples, in order
+        """
+        chunk_sizes = [PARALLEL_SAMPLING_CHUNK_SIZE] * (
+            self.n_injection // PARALLEL_SAMPLING_CHUNK_SIZE
+        )
+        if self.n_injection % PARALLEL_SAMPLING_CHUNK_SIZE > 0:
+            chunk_sizes.append(self.n_injection % PARALLEL_SAMPLING_CHUNK_SIZE)
+        seeds = [
+            int(child.generate_state(1)[0])
+            for child in np.random.SeedSequence(self.generation_seed).spawn(
+                len(chunk_sizes)
+            )
+        ]
+        logger.info(
+            f"Sampling {self.n_injection} injections in {len(chunk_sizes)} "
+            f"chunks using {self.n_processes} processes"
+        )
+        if self.n_processes > 1:
+            # Submit at most n_processes chunks ahead of the consumer, so the
+            # number of chunks held in memory is bounded
+            with ProcessPoolExecutor(
+                max_workers=self.n_processes,
+                initializer=_set_worker_priors,
+                initargs=(self.priors,),
+            ) as executor:
+                pending = deque()
+                for size, seed in zip(chunk_sizes, seeds):
+                    if len(pending) == self.n_processes:
+                        yield pending.popleft().result()
+                    pending.append(executor.submit(_sample_prior_chunk, size, seed))
+                while pending:
+                    yield pending.popleft().result()
+        else:
+            for size, seed in zip(chunk_sizes, seeds):
+                yield _sample_prior_chunk(size, seed, priors=self.priors)
+
     def get_injection_dataframe(self):
         """Samples parameters from the prior into a dataframe"""
-        inj_df = pd.DataFrame.from_dict(self.priors.sample(self.n_injection))
-        if self.gps_file is not None:
-            geocent_times = []
-            for start_time in self.gpstimes:
-                geocent_time = get_geocent_time_with_uncertainty(
-                    geocent_time=start_time
-                    + self.duration
-                    - self.post_trigger_duration,
-                    uncertainty=self.deltaT / 2.0,
-                )
-                geocent_times.append(geocent_time)
-            inj_df["geocenter_times"] = geocent_times
-        return inj_df
+        return pd.DataFrame.from_dict(self.get_injection_samples())
 
     @staticmethod
     def write_injection_dataframe(dataframe, filename, extension):
         """Writes dataframe into a file with a dat/json extension"""
+        samples = {key: dataframe[key].values for key in dataframe.columns}
+        InjectionCreator.write_injection_samples(samples, filename, extension)
+
+    @staticmethod
+    def write_injection_samples(samples, filename, extension):
+        """Writes a dictionary of sample arrays into a file with a dat/json extension
+
+        Purely numeric samples are written directly from the arrays, other
+        samples are written via the csv and json modules.
+        """
         path, extension = get_full_path(filename, extension)
-        if extension == "json":
-            injections = dict(injections=dataframe)
-            with open(path, "w") as file:
-                json.dump(
-                    injections, file, indent=2, cls=bilby.core.result.BilbyJsonEncoder
-                )
-        elif extension == "dat":
-            dataframe.to_csv(path, index=False, header=True, sep=" ")
-        else:
+        if extension not in INJECTION_FILE_EXTENSIONS:
             raise BilbyPipeCreateInjectionsError(
                 f"Extension {extension} not implemented"
             )
+        staged = _stage_samples(samples)
+        if extension == "json":
+            if staged is not None:
+                _write_json_fast(path, *staged)
+            else:
+                injections = dict(
+                    injections={
+                        key: np.asarray(val).tolist() for key, val in samples.items()
+                    }
+                )
+                with open(path, "w") as file:
+                    json.dump(
+                        injections,
+                        file,
+                        indent=2,
+                        cls=bilby.core.result.BilbyJsonEncoder,
+                    )
+        elif extension == "dat":
+            if staged is not None:
+                _write_dat_fast(path, *staged)
+            else:
+                with open(path, "w", newline="") as file:
+                    _write_dat_csv(file, samples, header=True)
+        elif extension in ["parquet", "feather"]:
+            _write_arrow(path, samples, extension)
         logger.info(f"Created injection file {path}")
 
     def generate_injection_file(self, filepath, extension):
@@ -243,8 +394,189 @@ class InjectionCreator(Input):
             f"n_injection={self.n_injection}, "
             f"generation_seed={self.generation_seed}"
         )
-        injection_dataframe = self.get_injection_dataframe()
-        self.write_injection_dataframe(injection_dataframe, filepath, extension)
+        path, extension = get_full_path(filepath, extension)
+        if self.sample_in_chunks and extension == "dat" and self.gps_file is None:
+            self.write_dat_injection_file_in_chunks(path)
+        else:
+            samples = self.get_injection_samples()
+            self.write_injection_samples(samples, path, extension)
+
+    def write_dat_injection_file_in_chunks(self, path):
+        """Writes each chunk of prior samples to a dat file as it is drawn
+
+        At most n_processes + 1 chunks of samples are held in memory at a
+        time (see `iter_prior_chunks`). The file is identical to writing the
+        output of `sample_priors_in_chunks`.
+        """
+        with open(path, "w", newline="") as file:
+            for ii, samples in enumerate(self.iter_prior_chunks()):
+                staged = _stage_samples(samples)
+                if staged is not None:
+                    keys, data = staged
+                    if ii == 0:
+                        file.write(" ".join(keys) + "\n")
+                    _write_dat_rows(file, data)
+                else:
+                    _write_dat_csv(file, samples, header=ii == 0)
+        logger.info(f"Created injection file {path}")
+
+
+def _set_worker_priors(priors):
+    """Stores the priors in a worker process, see `iter_prior_chunks`"""
+    global _worker_priors
+    _worker_priors = priors
+
+
+def _sample_prior_chunk(size, seed, priors=None):
+    """Draws size samples from the priors after seeding the global state
+
+    If priors is None, the priors stored by `_set_worker_priors` are used.
+    """
+    if priors is None:
+        priors = _worker_priors
+    np.random.seed(seed)
+    return priors.sample(size)
+
+
+def _stage_samples(samples):
+    """Stages numeric samples as a (n_parameters, n_samples) float64 array
+
+    Each parameter occupies one contiguous row (a structure-of-arrays
+    layout) so the same staged array serves both the json writer, which
+    emits one list per parameter, and the dat writer, which emits rows.
+
+    Parameters
+    ----------
+    samples: dict
+        A dictionary of equal-length arrays, keyed by parameter name
+
+    Returns
+    -------
+    keys, data: list, np.ndarray
+        The parameter names and the staged array, or None if any of the
+        samples are not floating point values
+    """
+    columns = [np.atleast_1d(val) for val in samples.values()]
+    if not all(column.dtype.kind == "f" for column in columns):
+        return None
+    return list(samples.keys()), np.array(columns, dtype=np.float64)
+
+
+def _write_dat_fast(path, keys, data, block_size=4096):
+    """Writes staged samples to a space-separated dat file with a header
+
+    Blocks of columns of the staged array are transposed into rows and
+    formatted in a single operation, avoiding the per-row overhead of
+    `np.savetxt` and the per-cell overhead of `pandas.DataFrame.to_csv`.
+    Values are written with "%r", the shortest representation which
+    round-trips, matching the output of `pandas.DataFrame.to_csv`.
+
+    Parameters
+    ----------
+    path: str
+        The path of the file to write
+    keys: list
+        The parameter names
+    data: np.ndarray
+        The (n_parameters, n_samples) staged samples, see `_stage_samples`
+    block_size: int
+        The number of rows to format in each write
+    """
+    with open(path, "w") as file:
+        file.write(" ".join(keys) + "\n")
+        _write_dat_rows(file, data, block_size)
+
+
+def _write_dat_rows(file, data, block_size=4096):
+    """Writes the rows of staged samples to an open file, see `_write_dat_fast`"""
+    row_format = " ".join(["%r"] * data.shape[0]) + "\n"
+    n_samples = data.shape[1]
+    for start in range(0, n_samples, block_size):
+        stop = min(start + block_size, n_samples)
+        block = data[:, start:stop].T.ravel().tolist()
+        file.write((row_format * (stop - start)) % tuple(block))
+
+
+def _write_dat_csv(file, samples, header):
+    """Writes samples of any type to an open file as space-separated rows
+
+    This is the fallback for samples which are not all floating point: the
+    output matches `pandas.DataFrame.to_csv(sep=" ", index=False)`, quoting
+    values which contain a space.
+
+    Parameters
+    ----------
+    file: file
+        An open file, created with `newline=""`
+    samples: dict
+        A dictionary of equal-length arrays, keyed by parameter name
+    header: bool
+        If True, write the parameter names as a header row
+    """
+    writer = csv.writer(file, delimiter=" ", lineterminator="\n")
+    if header:
+        writer.writerow(samples.keys())
+    columns = [np.atleast_1d(val).tolist() for val in samples.values()]
+    writer.writerows(zip(*columns))
+
+
+def _write_arrow(path, samples, extension):
+    """Writes samples to a zstd-compressed parquet or feather file
+
+    Parameters
+    ----------
+    path: str
+        The path of the file to write
+    samples: dict
+        A dictionary of equal-length arrays, keyed by parameter name
+    extension: str
+        Either "parquet" or "feather"
+    """
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:
+        raise BilbyPipeCreateInjectionsError(
+            f"Writing {extension} injection files requires pyarrow: "
+            "$ pip install pyarrow"
+        )
+    table = pyarrow.table({key: np.asarray(val) for key, val in samples.items()})
+    if extension == "parquet":
+        pyarrow.parquet.write_table(table, path, compression="zstd")
+    else:
+        pyarrow.feather.write_feather(table, path, compression="zstd")
+
+
+def _write_json_fast(path, keys, data):
+    """Writes staged samples to a json file as lists keyed by parameter name
+
+    If orjson is installed, the rows of the staged array are serialised
+    directly in C, otherwise the standard library json module is used. In
+    both cases the per-value dispatch of the bilby json encoder is avoided.
+
+    Parameters
+    ----------
+    path: str
+        The path of the file to write
+    keys: list
+        The parameter names
+    data: np.ndarray
+        The (n_parameters, n_samples) staged samples, see `_stage_samples`
+    """
+    if orjson is not None:
+        injections = {key: row for key, row in zip(keys, data)}
+        with open(path, "wb") as file:
+            file.write(
+                orjson.dumps(
+                    dict(injections=injections),
+                    option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2,
+                )
+            )
+    else:
+        injections = {key: row.tolist() for key, row in zip(keys, data)}
+        with open(path, "w") as file:
+            json.dump(dict(injections=injections), file, indent=2)
 
 
 def get_full_path(filename, extension):
@@ -277,6 +609,7 @@ def create_injection_file(
     generation_seed=None,
     extension="dat",
     default_prior="BBHPriorDict",
+    n_processes=1,
 ):
     """Makes injection file using arguments from the namespace args parameter"""
     injection_creator = InjectionCreator(
@@ -290,6 +623,7 @@ def create_injection_file(
         duration=duration,
         post_trigger_duration=post_trigger_duration,
         generation_seed=generation_seed,
+        n_processes=n_processes,
     )
     injection_creator.generate_injection_file(filename, extension)
 
@@ -309,4 +643,7 @@ def main():
         duration=args.duration,
         post_trigger_duration=args.post_trigger_duration,
         generation_seed=args.generation_seed,
+        extension=args.extension,
+        default_prior=args.default_prior,
+        n_processes=args.n_processes,
     )
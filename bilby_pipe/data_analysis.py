@@ -118,8 +118,16 @@ class DataAnalysisInput(Input):
 
     @sampling_seed.setter
     def sampling_seed(self, sampling_seed):
+        """Sets the sampling seed.
+
+        If no sampling seed has been provided, a random seed between 1 and 1e6
+        is drawn from fresh OS entropy, leaving the global numpy state as
+        found. The global state is then seeded, as bilby samplers and priors
+        draw from `np.random`.
+        """
         if sampling_seed is None:
-            sampling_seed = np.random.randint(1, 1e6)
+            entropy = np.random.SeedSequence().generate_state(1)[0]
+            sampling_seed = int(entropy % 999999) + 1
         self._samplng_seed = sampling_seed
         np.random.seed(sampling_seed)
         logger.info(f"Sampling seed set to {sampling_seed}")
@@ -183,6 +191,45 @@ class DataAnalysisInput(Input):
         self.meta_data.update(self._data_dump.meta_data)
         return self._data_dump
 
+    @property
+    def priors(self):
+        return super().priors
+
+    @priors.setter
+    def priors(self, priors):
+        self._priors = priors
+        # The likelihood is built from a copy of the priors: force a rebuild
+        if hasattr(self, "_likelihood"):
+            del self._likelihood
+
+    @property
+    def waveform_generator(self):
+        """The waveform generator, created on first access and then reused
+
+        The generator is built once, from the inputs set in `__init__` and the
+        interferometers of the data dump. Changing those inputs (e.g., the
+        waveform approximant, source model, frequencies, duration or sampling
+        frequency) after the first access does not rebuild it.
+        """
+        try:
+            return self._waveform_generator
+        except AttributeError:
+            self._waveform_generator = super().waveform_generator
+            return self._waveform_generator
+
+    @property
+    def likelihood(self):
+        """The likelihood, created on first access and then reused
+
+        As for the `waveform_generator`, the likelihood is built once and is
+        not rebuilt if the inputs change after the first access.
+        """
+        try:
+            return self._likelihood
+        except AttributeError:
+            self._likelihood = super().likelihood
+            return self._likelihood
+
     @property
     def result_class(self):
         """ The bilby result class to store results in """
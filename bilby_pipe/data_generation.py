@@ -337,15 +337,6 @@ class DataGenerationInput(Input):
                 )
             )
 
-    @property
-    def parameter_conversion(self):
-        if "binary_neutron_star" in self.frequency_domain_source_model:
-            return bilby.gw.conversion.convert_to_lal_binary_neutron_star_parameters
-        elif "binary_black_hole" in self.frequency_domain_source_model:
-            return bilby.gw.conversion.convert_to_lal_binary_black_hole_parameters
-        else:
-            return None
-
     @property
     def data_dict(self):
         return self._data_dict
@@ -1030,14 +1021,21 @@ class DataGenerationInput(Input):
 
     @interferometers.setter
     def interferometers(self, interferometers):
+        minimum_frequency_dict = None
+        if self.minimum_frequency is not None:
+            minimum_frequency_dict = self.minimum_frequency_dict
+        maximum_frequency_dict = None
+        if self.maximum_frequency is not None:
+            maximum_frequency_dict = self.maximum_frequency_dict
+        add_calibration_model = self.calibration_model is not None
         for ifo in interferometers:
             if isinstance(ifo, bilby.gw.detector.Interferometer) is False:
                 raise BilbyPipeError(f"ifo={ifo} is not a bilby Interferometer")
-            if self.minimum_frequency is not None:
-                ifo.minimum_frequency = self.minimum_frequency_dict[ifo.name]
-            if self.maximum_frequency is not None:
-                ifo.maximum_frequency = self.maximum_frequency_dict[ifo.name]
-            if self.calibration_model is not None:
+            if minimum_frequency_dict is not None:
+                ifo.minimum_frequency = minimum_frequency_dict[ifo.name]
+            if maximum_frequency_dict is not None:
+                ifo.maximum_frequency = maximum_frequency_dict[ifo.name]
+            if add_calibration_model:
                 self.add_calibration_model_to_interferometers(ifo)
 
         self._interferometers = interferometers
@@ -1076,7 +1074,7 @@ class DataGenerationInput(Input):
             )
         )
 
-        params = np.genfromtxt(self.roq_folder + "/params.dat", names=True)
+        params = self.read_roq_params_file(self.roq_folder + "/params.dat")
 
         freq_nodes_linear = np.load(self.roq_folder + "/fnodes_linear.npy")
         freq_nodes_quadratic = np.load(self.roq_folder + "/fnodes_quadratic.npy")
@@ -40,8 +40,24 @@ CBC_PIPELINES = ["gstlal", "pycbc", "mbtaonline", "spiir"]
 BURST_PIPELINES = ["cwb"]
 
 
+def _link_or_copy(src, dst):
+    """Place src at dst as a hardlink, falling back to a full copy if the
+    two are on different filesystems. Any existing dst is replaced.
+
+    Raises FileNotFoundError if src does not exist, leaving dst untouched.
+    """
+    if not os.path.isfile(src):
+        raise FileNotFoundError(f"No such file: '{src}'")
+    if os.path.isfile(dst) or os.path.islink(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src=src, dst=dst)
+
+
 def x509userproxy(outdir):
-    """Copies X509_USER_PROXY certificate from user's os.environ and
+    """Links (or copies) X509_USER_PROXY certificate from user's os.environ and
     places it inside the outdir, if the X509_USER_PROXY exists.
 
     Parameters
@@ -62,7 +78,7 @@ def x509userproxy(outdir):
     try:
         cert_path = os.environ[cert_alias]
         new_cert_path = os.path.join(outdir, "." + os.path.basename(cert_path))
-        shutil.copyfile(src=cert_path, dst=new_cert_path)
+        _link_or_copy(src=cert_path, dst=new_cert_path)
         x509userproxy = new_cert_path
     except FileNotFoundError as e:
         logger.warning(
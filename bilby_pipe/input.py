@@ -2,11 +2,17 @@
 """
 Module containing the main input class
 """
+import copy
+import functools
 import glob
+import hashlib
 import inspect
 import json
 import os
+import tempfile
+from collections import ChainMap
 from importlib import import_module
+from types import MappingProxyType
 
 import numpy as np
 import pandas as pd
@@ -27,10 +33,227 @@ from .utils import (
     pretty_print_dictionary,
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Text files larger than this (in bytes) are cached as .npy files and, if
+# np.loadtxt is implemented in python (numpy < 1.23), are read with pandas
+LOADTXT_MAXIMUM_FILE_SIZE = 1024 ** 2
+
+# The directory where the parsed arrays of large text files are cached
+NUMERIC_TEXT_FILE_CACHE_DIRECTORY = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "bilby_pipe"
+)
+
+# From numpy 1.23, np.loadtxt uses a C tokenizer which is as fast as pandas
+NUMPY_HAS_C_LOADTXT = tuple(int(v) for v in np.__version__.split(".")[:2]) >= (1, 23)
+
+# Json injection files larger than this (in bytes) are streamed with ijson
+JSON_STREAMING_MINIMUM_FILE_SIZE = 50 * 1024 ** 2
+
+# Streaming uses ijson.kvitems(..., use_float=True), added in ijson 3.1
+IJSON_SUPPORTS_STREAMING = ijson is not None and tuple(
+    int(v) for v in getattr(ijson, "__version__", "0.0").split(".")[:2]
+) >= (3, 1)
+
+
+def read_prior_file(prior_class, prior_file):
+    """Read a prior file, reusing earlier reads of an unchanged file
+
+    Parameters
+    ----------
+    prior_class: bilby.core.prior.PriorDict
+        The prior class used to read the file
+    prior_file: str
+        The path to the prior file. If None, prior_class is created without
+        a file
+
+    Returns
+    -------
+    priors: bilby.core.prior.PriorDict
+        An independent copy of the priors read from the file
+    """
+    if prior_file is None:
+        return prior_class(filename=None)
+    prior_file = os.path.abspath(prior_file)
+    priors = _read_prior_file(prior_class, prior_file, os.path.getmtime(prior_file))
+    return copy.deepcopy(priors)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_prior_file(prior_class, prior_file, mtime):
+    return prior_class(filename=prior_file)
+
+
+def read_roq_frequency_nodes(roq_folder, roq_scale_factor):
+    """Read the scaled ROQ frequency nodes, reusing earlier reads
+
+    Parameters
+    ----------
+    roq_folder: str
+        The folder containing fnodes_linear.npy and fnodes_quadratic.npy
+    roq_scale_factor: float
+        The factor the frequency nodes are multiplied by
+
+    Returns
+    -------
+    frequency_nodes_linear, frequency_nodes_quadratic: np.ndarray
+        The scaled frequency nodes. These are shared between calls and so
+        are read-only
+    """
+    filenames = [
+        os.path.abspath(os.path.join(roq_folder, f"fnodes_{basis}.npy"))
+        for basis in ["linear", "quadratic"]
+    ]
+    mtimes = tuple(os.path.getmtime(filename) for filename in filenames)
+    return _read_roq_frequency_nodes(tuple(filenames), roq_scale_factor, mtimes)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_roq_frequency_nodes(filenames, roq_scale_factor, mtimes):
+    # Memory-map the files so that the scaled nodes are the only allocation
+    frequency_nodes = tuple(
+        np.load(filename, mmap_mode="r") * roq_scale_factor for filename in filenames
+    )
+    for nodes in frequency_nodes:
+        nodes.setflags(write=False)
+    return frequency_nodes
+
+
+def _read_whitespace_delimited_file(filename, **kwargs):
+    """Read a whitespace delimited file with a header line into a DataFrame
+
+    As for `np.genfromtxt(filename, names=True)`, the column names are read
+    from the first non-empty line, which may start with a #, and any other
+    text following a # is ignored.
+
+    Parameters
+    ----------
+    filename: str
+        The file to read
+    kwargs:
+        Passed to pd.read_csv
+
+    Returns
+    -------
+    dataframe: pd.DataFrame
+    """
+    names, skiprows = None, 0
+    with open(filename, "r") as file:
+        for skiprows, line in enumerate(file, 1):
+            names = line.split("#", 1)[1] if line.lstrip().startswith("#") else line
+            names = names.split("#", 1)[0].split()
+            if len(names) > 0:
+                break
+    return pd.read_csv(
+        filename,
+        sep=r"\s+",
+        header=None,
+        names=names,
+        skiprows=skiprows,
+        comment="#",
+        **kwargs,
+    )
+
+
+def _decode_bilby_json(obj):
+    """Apply bilby.core.utils.decode_bilby_json to every dict in a json tree
+
+    The dicts are decoded depth-first, as for `json.load(file,
+    object_hook=decode_bilby_json)`.
+    """
+    if isinstance(obj, dict):
+        return bilby.core.utils.decode_bilby_json(
+            {key: _decode_bilby_json(val) for key, val in obj.items()}
+        )
+    elif isinstance(obj, list):
+        if any(isinstance(val, (dict, list)) for val in obj):
+            return [_decode_bilby_json(val) for val in obj]
+    return obj
+
+
+def _stream_json_injection_columns(filename):
+    """Read the injections of a json injection file one column at a time
+
+    The file is streamed with ijson and each numeric column is converted to
+    an array once parsed, so that only a single column is held as python
+    objects at any time. Both the bilby encoded DataFrame and the plain
+    dict-of-columns layouts are supported.
+
+    Parameters
+    ----------
+    filename: str
+        The json injection file
+
+    Returns
+    -------
+    columns: dict, None
+        The injection values keyed by parameter name, or None if the file
+        could not be parsed by ijson (e.g., it contains NaN)
+    """
+    with open(filename, "rb") as file:
+        try:
+            prefix = "injections"
+            for parent, event, value in ijson.parse(file):
+                if parent == prefix and event == "map_key":
+                    if value in ["__dataframe__", "content"]:
+                        prefix = "injections.content"
+                    break
+            file.seek(0)
+            columns = dict()
+            for key, values in ijson.kvitems(file, prefix, use_float=True):
+                values = _decode_bilby_json(values)
+                if isinstance(values, list):
+                    array = np.asarray(values)
+                    if array.dtype.kind in "fi":
+                        values = array
+                columns[key] = values
+        except ijson.JSONError as e:
+            logger.debug(f"Unable to stream {filename} with ijson: {e}")
+            return None
+    return columns
+
+
+@functools.lru_cache(maxsize=None)
+def _get_default_prior_files():
+    prior_files_glob = os.path.join(
+        os.path.dirname(os.path.realpath(__file__)), "data_files/*prior"
+    )
+    filenames = glob.glob(prior_files_glob)
+    return {os.path.basename(ff).rstrip(".prior"): ff for ff in filenames}
+
 
 class Input(object):
     """ Superclass of input handlers """
 
+    # The (parameter conversion, parameter generation, ROQ source model)
+    # functions for source models containing each source type, checked in order
+    _source_type_functions = [
+        (
+            "binary_neutron_star",
+            (
+                bilby.gw.conversion.convert_to_lal_binary_neutron_star_parameters,
+                bilby.gw.conversion.generate_all_bns_parameters,
+                bilby.gw.source.binary_neutron_star_roq,
+            ),
+        ),
+        (
+            "binary_black_hole",
+            (
+                bilby.gw.conversion.convert_to_lal_binary_black_hole_parameters,
+                bilby.gw.conversion.generate_all_bbh_parameters,
+                bilby.gw.source.binary_black_hole_roq,
+            ),
+        ),
+    ]
+
     @property
     def complete_ini_file(self):
         return f"{self.outdir}/{self.label}_config_complete.ini"
@@ -66,12 +289,13 @@ class Input(object):
         self._check_detectors_against_known_detectors()
 
     def _check_detectors_against_known_detectors(self):
-        for element in self.detectors:
-            if element not in self.known_detectors:
-                raise BilbyPipeError(
-                    'detectors contains "{}" not in the known '
-                    "detectors list: {} ".format(element, self.known_detectors)
-                )
+        known_detectors = set(self.known_detectors)
+        unknown = [det for det in self.detectors if det not in known_detectors]
+        if len(unknown) > 0:
+            raise BilbyPipeError(
+                "detectors contains {} not in the known "
+                "detectors list: {} ".format(unknown, self.known_detectors)
+            )
 
     @staticmethod
     def _split_string_by_space(string):
@@ -81,18 +305,28 @@ class Input(object):
     @staticmethod
     def _convert_string_to_list(string):
         """ Converts various strings to a list """
-        string = string.replace(",", " ")
-        string = string.replace("[", "")
-        string = string.replace("]", "")
-        string = string.replace('"', "")
-        string = string.replace("'", "")
-        string_list = string.split()
-        return string_list
+        return utils.sanitize_string_for_list(string)
+
+    def _check_directory_exists_and_if_not_mkdir(self, directory):
+        """Create the directory if needed, skipping directories already checked
+
+        The directory properties below are accessed many times while building
+        a workflow: remembering which directories have been checked avoids
+        repeated filesystem calls, which are slow on shared filesystems.
+        """
+        try:
+            checked_directories = self._checked_directories
+        except AttributeError:
+            checked_directories = self._checked_directories = set()
+        path = os.path.abspath(directory)
+        if path not in checked_directories:
+            utils.check_directory_exists_and_if_not_mkdir(directory)
+            checked_directories.add(path)
 
     @property
     def outdir(self):
         """ The path to the directory where output will be stored """
-        utils.check_directory_exists_and_if_not_mkdir(self._outdir)
+        self._check_directory_exists_and_if_not_mkdir(self._outdir)
         return self._outdir
 
     @outdir.setter
@@ -103,13 +337,13 @@ class Input(object):
     def submit_directory(self):
         """ The path to the directory where submit output will be stored """
         path = os.path.join(self._outdir, "submit")
-        utils.check_directory_exists_and_if_not_mkdir(path)
+        self._check_directory_exists_and_if_not_mkdir(path)
         return path
 
     @property
     def log_directory(self):
         """ The top-level directory for the log directories """
-        utils.check_directory_exists_and_if_not_mkdir(self._log_directory)
+        self._check_directory_exists_and_if_not_mkdir(self._log_directory)
         return self._log_directory
 
     @log_directory.setter
@@ -123,40 +357,40 @@ class Input(object):
     def data_generation_log_directory(self):
         """ The path to the directory where generation logs will be stored """
         path = os.path.join(self.log_directory, "log_data_generation")
-        utils.check_directory_exists_and_if_not_mkdir(path)
+        self._check_directory_exists_and_if_not_mkdir(path)
         return path
 
     @property
     def data_analysis_log_directory(self):
         """ The path to the directory where analysis logs will be stored """
         path = os.path.join(self.log_directory, "log_data_analysis")
-        utils.check_directory_exists_and_if_not_mkdir(path)
+        self._check_directory_exists_and_if_not_mkdir(path)
         return path
 
     @property
     def summary_log_directory(self):
         """ The path to the directory where pesummary logs will be stored """
         path = os.path.join(self.log_directory, "log_results_page")
-        utils.check_directory_exists_and_if_not_mkdir(path)
+        self._check_directory_exists_and_if_not_mkdir(path)
         return path
 
     @property
     def data_directory(self):
         """ The path to the directory where data output will be stored """
         path = os.path.join(self._outdir, "data")
-        utils.check_directory_exists_and_if_not_mkdir(path)
+        self._check_directory_exists_and_if_not_mkdir(path)
         return path
 
     @property
     def result_directory(self):
         """ The path to the directory where result output will be stored """
         path = os.path.join(self._outdir, "result")
-        utils.check_directory_exists_and_if_not_mkdir(path)
+        self._check_directory_exists_and_if_not_mkdir(path)
         return path
 
     @property
     def webdir(self):
-        utils.check_directory_exists_and_if_not_mkdir(self._webdir)
+        self._check_directory_exists_and_if_not_mkdir(self._webdir)
         return self._webdir
 
     @webdir.setter
@@ -195,7 +429,7 @@ class Input(object):
         self.gpstimes = gpstimes
 
     def read_gps_file(self):
-        gpstimes = np.loadtxt(self.gps_file, ndmin=2, delimiter=",")
+        gpstimes = self.read_numeric_text_file(self.gps_file, delimiter=",")
         if gpstimes.ndim > 1:
             logger.info(f"Reading column 0 from gps_file={self.gps_file}")
             gpstimes = gpstimes[:, 0]
@@ -238,9 +472,81 @@ class Input(object):
         Each row of file is an array, hence ndmin = 2
         [ [timshift1,...], [], [] ...]
         """
-        timeslides_list = np.loadtxt(self.timeslide_file, ndmin=2)
+        timeslides_list = self.read_numeric_text_file(self.timeslide_file)
         return timeslides_list
 
+    @staticmethod
+    def read_numeric_text_file(filename, delimiter=None):
+        """Read a text file of numbers into a 2D float array
+
+        Files are parsed with np.loadtxt, except for files larger than
+        LOADTXT_MAXIMUM_FILE_SIZE with numpy < 1.23: these are parsed with the
+        pandas C tokenizer (with exact float round-tripping) as np.loadtxt is
+        implemented in python. The parsed array of a large file is also saved
+        to a `.npy` file in NUMERIC_TEXT_FILE_CACHE_DIRECTORY (by default
+        `$XDG_CACHE_HOME/bilby_pipe` or `~/.cache/bilby_pipe`), named after
+        the absolute path of the file, which is loaded instead while it is
+        newer than the file. The directory of the file itself is never
+        written to, and a cache which can not be read or written is ignored.
+
+        Parameters
+        ----------
+        filename: str
+            The file to read. Lines starting with # are ignored
+        delimiter: str, optional
+            The column delimiter, if None, any whitespace
+
+        Returns
+        -------
+        array: np.ndarray
+            A (number of rows, number of columns) array
+        """
+        if os.path.getsize(filename) <= LOADTXT_MAXIMUM_FILE_SIZE:
+            return np.loadtxt(filename, ndmin=2, delimiter=delimiter)
+
+        key = f"{os.path.abspath(filename)}:{delimiter}".encode()
+        cache = os.path.join(
+            NUMERIC_TEXT_FILE_CACHE_DIRECTORY,
+            f"{os.path.basename(filename)}-{hashlib.sha1(key).hexdigest()}.npy",
+        )
+        try:
+            if os.path.isfile(cache) and (
+                os.path.getmtime(cache) >= os.path.getmtime(filename)
+            ):
+                logger.debug(f"Reading cached {filename} from {cache}")
+                return np.load(cache)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Unable to read cache {cache} of {filename}: {e}")
+
+        if NUMPY_HAS_C_LOADTXT:
+            array = np.loadtxt(filename, ndmin=2, delimiter=delimiter)
+        else:
+            array = pd.read_csv(
+                filename,
+                header=None,
+                sep=r"\s+" if delimiter is None else delimiter,
+                comment="#",
+                dtype=np.float64,
+                engine="c",
+                float_precision="round_trip",
+            ).to_numpy()
+        # Write to a temporary file and move it into place so that parallel
+        # jobs sharing the file never load a partially written cache
+        temporary = None
+        try:
+            os.makedirs(NUMERIC_TEXT_FILE_CACHE_DIRECTORY, exist_ok=True)
+            fd, temporary = tempfile.mkstemp(
+                suffix=".npy", dir=NUMERIC_TEXT_FILE_CACHE_DIRECTORY
+            )
+            with os.fdopen(fd, "wb") as file:
+                np.save(file, array)
+            os.replace(temporary, cache)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Unable to cache {filename} to {cache}: {e}")
+            if temporary is not None and os.path.exists(temporary):
+                os.remove(temporary)
+        return array
+
     def _parse_timeslide_file(self):
         """Parse the timeslide file and check for correctness.
 
@@ -264,10 +570,12 @@ class Input(object):
                     number_rows, len(self.gpstimes)
                 )
             )
-        times = np.hsplit(timeslides_list, len(self.detectors))
-        self.timeslides = {}
-        for i in range(len(self.detectors)):
-            self.timeslides.update({self.detectors[i]: times[i].flatten()})
+        # Column views of the parsed array: no per-detector copies are made
+        self.timeslides = {
+            det: timeslides_list[:, i] for i, det in enumerate(self.detectors)
+        }
+        self._timeslides_array = timeslides_list
+        self._timeslides_detectors = tuple(self.detectors)
         logger.info(
             f"{number_rows} timeslides found in timeslide_file={self.timeslide_file}"
         )
@@ -280,13 +588,13 @@ class Input(object):
         """
         if not hasattr(self, "timeslides"):
             raise BilbyPipeError("Timeslide file must be provided.")
-        if any(len(t) <= idx for t in self.timeslides.values()):
+        if len(self._timeslides_array) <= idx:
             raise BilbyPipeError(
                 f"Timeslide index={idx} > number of timeslides available."
             )
-        timeslide_val = {
-            det: timeslide[idx] for det, timeslide in self.timeslides.items()
-        }
+        timeslide_val = dict(
+            zip(self._timeslides_detectors, self._timeslides_array[idx].tolist())
+        )
         logger.info(f"Timeslide value: {timeslide_val}")
         return timeslide_val
 
@@ -295,21 +603,27 @@ class Input(object):
         """
         The bilby function to pass to the waveform_generator
 
-        This can be a function defined in an external package.
+        This can be a function defined in an external package. The function
+        is resolved on first access and then reused until
+        `frequency_domain_source_model` is set.
         """
-        if self.frequency_domain_source_model in bilby.gw.source.__dict__.keys():
-            model = self._frequency_domain_source_model
+        try:
+            return self._bilby_frequency_domain_source_model
+        except AttributeError:
+            pass
+        model = self._frequency_domain_source_model
+        if model in bilby.gw.source.__dict__:
             logger.info(f"Using the {model} source model")
-            return bilby.gw.source.__dict__[model]
-        elif "." in self.frequency_domain_source_model:
-            split_model = self._frequency_domain_source_model.split(".")
+            source_model = bilby.gw.source.__dict__[model]
+        elif "." in model:
+            split_model = model.split(".")
             module = ".".join(split_model[:-1])
             func = split_model[-1]
-            return getattr(import_module(module), func)
+            source_model = getattr(import_module(module), func)
         else:
-            raise BilbyPipeError(
-                f"No source model {self._frequency_domain_source_model} found."
-            )
+            raise BilbyPipeError(f"No source model {model} found.")
+        self._bilby_frequency_domain_source_model = source_model
+        return source_model
 
     @property
     def reference_frequency(self):
@@ -386,14 +700,11 @@ class Input(object):
 
     @property
     def bilby_roq_frequency_domain_source_model(self):
-        if "binary_neutron_star" in self.frequency_domain_source_model:
-            logger.info("Using the binary_neutron_star_roq source model")
-            return bilby.gw.source.binary_neutron_star_roq
-        elif "binary_black_hole" in self.frequency_domain_source_model:
-            logger.info("Using the binary_black_hole_roq source model")
-            return bilby.gw.source.binary_black_hole_roq
-        else:
+        source_model = self._roq_source_model
+        if source_model is None:
             raise BilbyPipeError("Unable to determine roq_source from source model")
+        logger.info(f"Using the {source_model.__name__} source model")
+        return source_model
 
     @property
     def frequency_domain_source_model(self):
@@ -403,6 +714,21 @@ class Input(object):
     @frequency_domain_source_model.setter
     def frequency_domain_source_model(self, frequency_domain_source_model):
         self._frequency_domain_source_model = frequency_domain_source_model
+        (
+            self._parameter_conversion,
+            self._parameter_generation,
+            self._roq_source_model,
+        ) = next(
+            (
+                functions
+                for source_type, functions in self._source_type_functions
+                if source_type in frequency_domain_source_model
+            ),
+            (None, None, None),
+        )
+        # Force the bilby source model to be resolved again
+        if hasattr(self, "_bilby_frequency_domain_source_model"):
+            del self._bilby_frequency_domain_source_model
 
     @property
     def trigger_time(self):
@@ -426,14 +752,16 @@ class Input(object):
 
     @property
     def start_time(self):
-        if hasattr(self, "_start_time"):
-            self._verify_start_time(self._start_time)
+        """The segment start time
+
+        If not set, this is inferred from the trigger time, post-trigger
+        duration and duration at each access. A start time which has been set
+        is verified against these once, when set.
+        """
+        if getattr(self, "_start_time", None) is not None:
             return self._start_time
         try:
-            self._start_time = (
-                self.trigger_time + self.post_trigger_duration - self.duration
-            )
-            return self._start_time
+            return self.trigger_time + self.post_trigger_duration - self.duration
         except AttributeError:
             logger.warning("Unable to calculate default segment start time")
             return None
@@ -554,28 +882,70 @@ class Input(object):
 
     @staticmethod
     def read_injection_file(injection_file):
-        if "json" in injection_file:
+        extension = os.path.splitext(injection_file)[1].lower()
+        if extension == ".json":
             return Input.read_json_injection_file(injection_file)
-        elif "dat" in injection_file:
+        elif extension == ".dat":
             return Input.read_dat_injection_file(injection_file)
+        elif extension == ".parquet":
+            return pd.read_parquet(injection_file)
+        elif extension == ".feather":
+            return pd.read_feather(injection_file)
+        else:
+            raise BilbyPipeError(
+                f"Injection file {injection_file} has unknown extension {extension}"
+            )
 
     @staticmethod
     def read_json_injection_file(injection_file):
-        with open(injection_file, "r") as file:
-            injection_dict = json.load(
-                file, object_hook=bilby.core.utils.decode_bilby_json
-            )
-        injection_df = injection_dict["injections"]
-        try:
-            injection_df = pd.DataFrame(injection_df)
-        except ValueError:
-            # If injection_df is a dictionary of single elements, set the index-array in pandas
-            injection_df = pd.DataFrame(injection_df, index=[0])
-        return injection_df
+        injection_dict = None
+        if (
+            IJSON_SUPPORTS_STREAMING
+            and os.path.getsize(injection_file) > JSON_STREAMING_MINIMUM_FILE_SIZE
+        ):
+            columns = _stream_json_injection_columns(injection_file)
+            if columns is not None:
+                injection_dict = dict(injections=columns)
+        if injection_dict is None and orjson is not None:
+            with open(injection_file, "rb") as file:
+                try:
+                    injection_dict = _decode_bilby_json(orjson.loads(file.read()))
+                except orjson.JSONDecodeError:
+                    # orjson is strict: e.g., NaN and Infinity are rejected
+                    logger.debug(f"Unable to read {injection_file} with orjson")
+        if injection_dict is None:
+            with open(injection_file, "r") as file:
+                injection_dict = json.load(
+                    file, object_hook=bilby.core.utils.decode_bilby_json
+                )
+        injections = injection_dict["injections"]
+        if isinstance(injections, pd.DataFrame):
+            return injections
+        first_value = next(iter(injections.values()), [])
+        if isinstance(first_value, (list, tuple, np.ndarray, pd.Series)):
+            return pd.DataFrame(injections)
+        else:
+            # A dictionary of single elements: set the index-array in pandas
+            return pd.DataFrame(injections, index=[0])
 
     @staticmethod
     def read_dat_injection_file(injection_file):
-        return pd.read_csv(injection_file, delim_whitespace=True)
+        return _read_whitespace_delimited_file(injection_file)
+
+    @staticmethod
+    def read_roq_params_file(filename):
+        """Read an ROQ params.dat file into a structured float array
+
+        This is equivalent to `np.genfromtxt(filename, names=True)`, including
+        returning a 0-d array for a single row, but uses the pandas C parser.
+        """
+        params = _read_whitespace_delimited_file(
+            filename, dtype=np.float64, engine="c"
+        ).to_records(index=False)
+        params = params.view(np.ndarray)
+        if len(params) == 1:
+            params = params.reshape(())
+        return params
 
     @property
     def spline_calibration_envelope_dict(self):
@@ -652,9 +1022,7 @@ class Input(object):
                 self.minimum_frequency_dict = convert_string_to_dict(
                     minimum_frequency, "minimum-frequency"
                 )
-                self._minimum_frequency = np.min(
-                    [xx for xx in self._minimum_frequency_dict.values()]
-                ).item()
+                self._minimum_frequency = min(self._minimum_frequency_dict.values())
 
     @property
     def minimum_frequency_dict(self):
@@ -701,9 +1069,7 @@ class Input(object):
                 self.maximum_frequency_dict = convert_string_to_dict(
                     maximum_frequency, "maximum-frequency"
                 )
-                self._maximum_frequency = np.max(
-                    [xx for xx in self._maximum_frequency_dict.values()]
-                ).item()
+                self._maximum_frequency = max(self._maximum_frequency_dict.values())
 
     @property
     def maximum_frequency_dict(self):
@@ -711,8 +1077,9 @@ class Input(object):
 
     @maximum_frequency_dict.setter
     def maximum_frequency_dict(self, maximum_frequency_dict):
+        detectors = set(self.detectors)
         for det in maximum_frequency_dict.keys():
-            if det not in self.detectors:
+            if det not in detectors:
                 raise BilbyPipeError(
                     f"Input maximum frequency required for detector {det}"
                 )
@@ -725,14 +1092,10 @@ class Input(object):
     @staticmethod
     def get_default_prior_files():
         """ Returns a dictionary of the default priors """
-        prior_files_glob = os.path.join(
-            os.path.dirname(os.path.realpath(__file__)), "data_files/*prior"
-        )
-        filenames = glob.glob(prior_files_glob)
-        return {os.path.basename(ff).rstrip(".prior"): ff for ff in filenames}
+        return dict(_get_default_prior_files())
 
     def get_distance_file_lookup_table(self, prior_file_str):
-        direc = os.path.dirname(self.default_prior_files[prior_file_str])
+        direc = os.path.dirname(_get_default_prior_files()[prior_file_str])
         fname = f"{prior_file_str}_distance_marginalization_lookup.npz"
         return os.path.join(direc, fname)
 
@@ -749,8 +1112,8 @@ class Input(object):
         elif os.path.isfile(os.path.basename(prior_file)):
             # Allows for the prior-file to be moved to the local directory (file-transfer mechanism)
             self._prior_file = os.path.basename(prior_file)
-        elif prior_file in self.default_prior_files:
-            self._prior_file = self.default_prior_files[prior_file]
+        elif prior_file in _get_default_prior_files():
+            self._prior_file = _get_default_prior_files()[prior_file]
             self.distance_marginalization_lookup_table = (
                 self.get_distance_file_lookup_table(prior_file)
             )
@@ -827,9 +1190,16 @@ class Input(object):
 
     @property
     def combined_default_prior_dicts(self):
-        d = bilby.core.prior.__dict__.copy()
-        d.update(bilby.gw.prior.__dict__)
-        return d
+        """A view of the bilby.gw.prior and bilby.core.prior namespaces
+
+        Names in bilby.gw.prior take precedence. No copy of the module
+        dictionaries is made; the view is read-only so that it cannot be
+        used to modify the module namespaces.
+        """
+        return ChainMap(
+            MappingProxyType(bilby.gw.prior.__dict__),
+            MappingProxyType(bilby.core.prior.__dict__),
+        )
 
     @property
     def time_parameter(self):
@@ -886,12 +1256,13 @@ class Input(object):
         prior: bilby.core.prior.PriorDict
             The generated prior
         """
-        if self.default_prior in self.combined_default_prior_dicts.keys():
-            prior_class = self.combined_default_prior_dicts[self.default_prior]
+        prior_dicts = self.combined_default_prior_dicts
+        if self.default_prior in prior_dicts:
+            prior_class = prior_dicts[self.default_prior]
             if self.prior_dict is not None:
                 priors = prior_class(dictionary=self.prior_dict)
             else:
-                priors = prior_class(filename=self.prior_file)
+                priors = read_prior_file(prior_class, self.prior_file)
         else:
             raise ValueError("Unable to set prior: default_prior unavailable")
 
@@ -968,47 +1339,48 @@ class Input(object):
         if getattr(self, "_calibration_prior", None) is not None:
             return self._calibration_prior
         self._calibration_prior = bilby.core.prior.PriorDict()
-        if self.calibration_model is not None:
-            for det in self.detectors:
-                if det in self.spline_calibration_envelope_dict:
-                    logger.info(
-                        "Creating calibration prior for {} from {}".format(
-                            det, self.spline_calibration_envelope_dict[det]
-                        )
-                    )
-                    self._calibration_prior.update(
-                        bilby.gw.prior.CalibrationPriorDict.from_envelope_file(
-                            self.spline_calibration_envelope_dict[det],
-                            minimum_frequency=self.minimum_frequency_dict[det],
-                            maximum_frequency=self.maximum_frequency_dict[det],
-                            n_nodes=self.spline_calibration_nodes,
-                            label=det,
-                        )
+        # Unset calibration dicts are None (or absent) and so have no entries
+        envelope_dict = self.spline_calibration_envelope_dict or dict()
+        amplitude_dict = (
+            getattr(self, "spline_calibration_amplitude_uncertainty_dict", None)
+            or dict()
+        )
+        phase_dict = (
+            getattr(self, "spline_calibration_phase_uncertainty_dict", None) or dict()
+        )
+        for det in self.detectors:
+            if det in envelope_dict:
+                logger.info(
+                    "Creating calibration prior for {} from {}".format(
+                        det, envelope_dict[det]
                     )
-                elif (
-                    det in self.spline_calibration_amplitude_uncertainty_dict
-                    and det in self.spline_calibration_phase_uncertainty_dict
-                ):
-                    logger.info(
-                        "Creating calibration prior for {} from "
-                        "provided constant uncertainty values.".format(det)
+                )
+                self._calibration_prior.update(
+                    bilby.gw.prior.CalibrationPriorDict.from_envelope_file(
+                        envelope_dict[det],
+                        minimum_frequency=self.minimum_frequency_dict[det],
+                        maximum_frequency=self.maximum_frequency_dict[det],
+                        n_nodes=self.spline_calibration_nodes,
+                        label=det,
                     )
-                    self._calibration_prior.update(
-                        bilby.gw.prior.CalibrationPriorDict.constant_uncertainty_spline(
-                            amplitude_sigma=self.spline_calibration_amplitude_uncertainty_dict[
-                                det
-                            ],
-                            phase_sigma=self.spline_calibration_phase_uncertainty_dict[
-                                det
-                            ],
-                            minimum_frequency=self.minimum_frequency_dict[det],
-                            maximum_frequency=self.maximum_frequency_dict[det],
-                            n_nodes=self.spline_calibration_nodes,
-                            label=det,
-                        )
+                )
+            elif det in amplitude_dict and det in phase_dict:
+                logger.info(
+                    "Creating calibration prior for {} from "
+                    "provided constant uncertainty values.".format(det)
+                )
+                self._calibration_prior.update(
+                    bilby.gw.prior.CalibrationPriorDict.constant_uncertainty_spline(
+                        amplitude_sigma=amplitude_dict[det],
+                        phase_sigma=phase_dict[det],
+                        minimum_frequency=self.minimum_frequency_dict[det],
+                        maximum_frequency=self.maximum_frequency_dict[det],
+                        n_nodes=self.spline_calibration_nodes,
+                        label=det,
                     )
-                else:
-                    logger.warning(f"No calibration information for {det}")
+                )
+            else:
+                logger.warning(f"No calibration information for {det}")
         return self._calibration_prior
 
     @property
@@ -1053,6 +1425,12 @@ class Input(object):
             Likelihood = bilby.gw.likelihood.GravitationalWaveTransient
             likelihood_kwargs.update(jitter_time=self.jitter_time)
 
+        elif self.likelihood_type == "NumbaGravitationalWaveTransient":
+            # Imported here so that numba is only loaded when it is used
+            from .likelihood import NumbaGravitationalWaveTransient as Likelihood
+
+            likelihood_kwargs.update(jitter_time=self.jitter_time)
+
         elif self.likelihood_type == "ROQGravitationalWaveTransient":
             Likelihood = bilby.gw.likelihood.ROQGravitationalWaveTransient
 
@@ -1129,29 +1507,34 @@ class Input(object):
 
     @property
     def roq_likelihood_kwargs(self):
-        if hasattr(self, "likelihood_roq_params"):
-            params = self.likelihood_roq_params
-        else:
-            params = np.genfromtxt(self.roq_folder + "/params.dat", names=True)
+        """The ROQ-specific likelihood kwargs
 
-        if hasattr(self, "likelihood_roq_weights"):
-            weights = self.likelihood_roq_weights
-        else:
-            weights = self.meta_data["weight_file"]
-            logger.info(f"Loading ROQ weights from {weights}")
+        If not already available (e.g., from the data dump), the ROQ params
+        and weights are read from the roq-folder and weight file on first
+        access and stored as `likelihood_roq_params` and
+        `likelihood_roq_weights` so that later likelihoods reuse them.
+        """
+        if not hasattr(self, "likelihood_roq_params"):
+            self.likelihood_roq_params = self.read_roq_params_file(
+                self.roq_folder + "/params.dat"
+            )
+
+        if not hasattr(self, "likelihood_roq_weights"):
+            Likelihood = bilby.gw.likelihood.ROQGravitationalWaveTransient
+            self.likelihood_roq_weights = Likelihood.load_weights(
+                self.meta_data["weight_file"]
+            )
 
         return dict(
-            weights=weights, roq_params=params, roq_scale_factor=self.roq_scale_factor
+            weights=self.likelihood_roq_weights,
+            roq_params=self.likelihood_roq_params,
+            roq_scale_factor=self.roq_scale_factor,
         )
 
     @property
     def parameter_conversion(self):
-        if "binary_neutron_star" in self._frequency_domain_source_model:
-            return bilby.gw.conversion.convert_to_lal_binary_neutron_star_parameters
-        elif "binary_black_hole" in self._frequency_domain_source_model:
-            return bilby.gw.conversion.convert_to_lal_binary_black_hole_parameters
-        else:
-            return None
+        """ The parameter conversion for the source model, resolved when set """
+        return self._parameter_conversion
 
     @property
     def waveform_generator(self):
@@ -1163,10 +1546,9 @@ class Input(object):
                     self.likelihood_type, self.roq_folder
                 )
             )
-            freq_nodes_linear = np.load(self.roq_folder + "/fnodes_linear.npy")
-            freq_nodes_quadratic = np.load(self.roq_folder + "/fnodes_quadratic.npy")
-            freq_nodes_linear *= self.roq_scale_factor
-            freq_nodes_quadratic *= self.roq_scale_factor
+            freq_nodes_linear, freq_nodes_quadratic = read_roq_frequency_nodes(
+                self.roq_folder, self.roq_scale_factor
+            )
 
             waveform_arguments["frequency_nodes_linear"] = freq_nodes_linear
             waveform_arguments["frequency_nodes_quadratic"] = freq_nodes_quadratic
@@ -1213,12 +1595,8 @@ class Input(object):
 
     @property
     def parameter_generation(self):
-        if "binary_neutron_star" in self._frequency_domain_source_model:
-            return bilby.gw.conversion.generate_all_bns_parameters
-        elif "binary_black_hole" in self._frequency_domain_source_model:
-            return bilby.gw.conversion.generate_all_bbh_parameters
-        else:
-            return None
+        """ The parameter generation for the source model, resolved when set """
+        return self._parameter_generation
 
     @property
     def summarypages_arguments(self):
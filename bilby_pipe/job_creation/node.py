@@ -1,3 +1,4 @@
+import functools
 import os
 import re
 import shutil
@@ -9,6 +10,13 @@ import pycondor
 from ..utils import CHECKPOINT_EXIT_CODE, ArgumentsString, BilbyPipeError, logger
 
 
+@functools.lru_cache(maxsize=None)
+def _which(exe_name, path):
+    """Cached shutil.which: every node of a DAG looks up its executable, and
+    each lookup stats every directory on the PATH"""
+    return shutil.which(exe_name, path=path)
+
+
 class Node(object):
     """ Base Node object, handles creation of arguments, executables, etc """
 
@@ -46,7 +54,7 @@ class Node(object):
 
     @staticmethod
     def _get_executable_path(exe_name):
-        exe = shutil.which(exe_name)
+        exe = _which(exe_name, os.environ.get("PATH"))
         if exe is not None:
             return exe
         else:
@@ -109,7 +117,7 @@ class Node(object):
         self.job = pycondor.Job(
             name=job_name,
             executable=self.executable,
-            submit=self.inputs.submit_directory,
+            submit=self.dag.submit_directory,
             request_memory=self.request_memory,
             request_disk=self.request_disk,
             request_cpus=self.request_cpus,
@@ -4,6 +4,7 @@ Module containing the tools for outputting slurm submission scripts
 """
 
 import os
+import shlex
 import subprocess
 
 from ..utils import logger
@@ -26,8 +27,8 @@ class SubmitSLURM(object):
         for node in self.dag.nodes:
             if "_generation" in node.name:
                 # Run the job locally
-                cmd = " ".join([node.executable, node.args[0].arg])
-                subprocess.run(cmd, shell=True)
+                cmd = [node.executable] + shlex.split(node.args[0].arg)
+                subprocess.run(cmd)
                 # Remove the children
                 for other_node in self.dag.nodes:
                     if node in other_node.parents:
@@ -82,16 +83,20 @@ class SubmitSLURM(object):
 
             for node, indx in zip(self.dag.nodes, jids):
                 # Generate the real slurm arguments from the dag node and the parsed slurm args
-                job_slurm_args = slurm_args
-                job_slurm_args += " --nodes=1"
-                job_slurm_args += f" --ntasks-per-node={node.request_cpus}"
-                job_slurm_args += " --mem={}G".format(
-                    int(float(node.request_memory.split(" ")[0]))
+                job_slurm_args = " ".join(
+                    [
+                        slurm_args,
+                        "--nodes=1",
+                        f"--ntasks-per-node={node.request_cpus}",
+                        "--mem={}G".format(
+                            int(float(node.request_memory.split(" ")[0]))
+                        ),
+                        f"--time={node.slurm_walltime}",
+                        f"--job-name={node.name}",
+                    ]
                 )
-                job_slurm_args += f" --time={node.slurm_walltime}"
-                job_slurm_args += f" --job-name={node.name}"
 
-                submit_str = f"\njid{indx}=($(sbatch {job_slurm_args} "
+                submit_parts = [f"\njid{indx}=($(sbatch {job_slurm_args} "]
 
                 # get list of all parents associated with job
                 parents = [job.name for job in node.parents]
@@ -99,24 +104,25 @@ class SubmitSLURM(object):
                 if len(parents) > 0:
                     # only run subsequent jobs after parent has
                     # *successfully* completed
-                    submit_str += "--dependency=afterok"
-
-                    for parent in parents:
-                        submit_str += f":${{jid{job_dict[parent]}[-1]}}"
+                    submit_parts.append("--dependency=afterok")
+                    submit_parts.extend(
+                        f":${{jid{job_dict[parent]}[-1]}}" for parent in parents
+                    )
                 # get output file path from dag and use for slurm
                 output_file = self._output_name_from_dag(node.extra_lines)
 
-                submit_str += f" --output={output_file}"
-                submit_str += f" --error={output_file.replace('.out', '.err')}"
+                submit_parts.append(f" --output={output_file}")
+                submit_parts.append(f" --error={output_file.replace('.out', '.err')}")
 
                 job_script = self._write_individual_processes(
                     node.name, node.executable, node.args[0].arg
                 )
 
-                submit_str += f" {job_script}))\n\n"
-                submit_str += (
+                submit_parts.append(f" {job_script}))\n\n")
+                submit_parts.append(
                     f'echo "jid{indx} ${{jid{indx}[-1]}}" >> {self.slurm_id_file}'
                 )
+                submit_str = "".join(submit_parts)
 
                 f.write(f"{submit_str}\n")
 
@@ -0,0 +1,105 @@
+"""
+Module containing likelihood classes specific to bilby_pipe
+"""
+import numpy as np
+
+import bilby
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _inner_products_numpy(signal, data, weights):
+    """Compute the noise-weighted inner products <h|d> and <h|h>
+
+    Parameters
+    ----------
+    signal, data: array_like
+        The complex frequency-domain signal and data in the analysis band
+    weights: array_like
+        The real weights, 4 / (duration * PSD), in the analysis band
+
+    Returns
+    -------
+    d_inner_h: complex
+    optimal_snr_squared: float
+    """
+    weighted_signal = np.conj(signal) * weights
+    d_inner_h = np.sum(weighted_signal * data)
+    optimal_snr_squared = np.sum(weighted_signal * signal).real
+    return d_inner_h, optimal_snr_squared
+
+
+def _inner_products_loop(signal, data, weights):
+    d_inner_h = 0j
+    optimal_snr_squared = 0.0
+    for ii in range(weights.shape[0]):
+        weighted_signal = signal[ii].conjugate() * weights[ii]
+        d_inner_h += weighted_signal * data[ii]
+        optimal_snr_squared += (weighted_signal * signal[ii]).real
+    return d_inner_h, optimal_snr_squared
+
+
+if numba is not None:
+    _inner_products = numba.njit(fastmath=True, cache=True)(_inner_products_loop)
+else:
+    _inner_products = _inner_products_numpy
+
+
+class NumbaGravitationalWaveTransient(bilby.gw.likelihood.GravitationalWaveTransient):
+    """A GravitationalWaveTransient with a compiled inner-product kernel
+
+    The masked data and the inverse PSD are computed once per interferometer
+    and both inner products are evaluated in a single pass over the analysis
+    band. If numba is installed, this pass is JIT-compiled, otherwise a numpy
+    implementation is used. Time marginalization requires the full FFT over
+    the segment and so falls back to the bilby implementation.
+
+    The data and PSD are cached on first use: if these are modified after the
+    likelihood is created, call `reset_frequency_domain_cache`.
+    """
+
+    def reset_frequency_domain_cache(self):
+        """ Clear the cached masked data and noise weights """
+        self._frequency_domain_cache = dict()
+
+    def _get_frequency_domain_cache(self, interferometer):
+        if not hasattr(self, "_frequency_domain_cache"):
+            self.reset_frequency_domain_cache()
+        try:
+            return self._frequency_domain_cache[interferometer.name]
+        except KeyError:
+            mask = interferometer.strain_data.frequency_mask
+            data = np.ascontiguousarray(
+                interferometer.frequency_domain_strain[mask], dtype=complex
+            )
+            weights = np.ascontiguousarray(
+                4
+                / interferometer.strain_data.duration
+                / interferometer.power_spectral_density_array[mask],
+                dtype=float,
+            )
+            self._frequency_domain_cache[interferometer.name] = (mask, data, weights)
+            return mask, data, weights
+
+    def calculate_snrs(self, waveform_polarizations, interferometer):
+        if self.time_marginalization:
+            return super().calculate_snrs(waveform_polarizations, interferometer)
+
+        signal = interferometer.get_detector_response(
+            waveform_polarizations, self.parameters
+        )
+        mask, data, weights = self._get_frequency_domain_cache(interferometer)
+        d_inner_h, optimal_snr_squared = _inner_products(
+            np.ascontiguousarray(signal[mask], dtype=complex), data, weights
+        )
+        complex_matched_filter_snr = d_inner_h / (optimal_snr_squared ** 0.5)
+
+        return self._CalculatedSNRs(
+            d_inner_h=d_inner_h,
+            optimal_snr_squared=optimal_snr_squared,
+            complex_matched_filter_snr=complex_matched_filter_snr,
+            d_inner_h_squared_tc_array=None,
+        )
@@ -346,8 +346,10 @@ def write_complete_config_file(parser, args, inputs):
         "_webdir",
         "_prior_dict",
         "timeslides",
+        "_timeslides_array",
         "_log_directory",
         "scheduler_module",
+        "_checked_directories",
     ]
     differences = []
     for key, val in inputs.__dict__.items():
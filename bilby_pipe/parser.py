@@ -594,7 +594,8 @@ def create_parser(top_level=True):
         default="GravitationalWaveTransient",
         help=(
             "The likelihood. Can be one of [GravitationalWaveTransient, "
-            "ROQGravitationalWaveTransient] or python path to a bilby "
+            "NumbaGravitationalWaveTransient, ROQGravitationalWaveTransient] "
+            "or python path to a bilby "
             "likelihood class available in the users installation. "
             "Need to specify --roq-folder if ROQ likelihood used"
         ),
@@ -807,7 +808,8 @@ def create_parser(top_level=True):
         type=str,
         default="Default",
         help=(
-            "Dictionary of sampler-kwargs to pass in, e.g., {nlive: 1000} OR "
+            "Dictionary of sampler-kwargs to pass in, e.g., {nlive: 1000} "
+            '(strict JSON, e.g. {"nlive": 1000}, is also accepted) OR '
             "pass pre-defined set of sampler-kwargs {Default, FastTest}"
         ),
     )
@@ -14,6 +14,8 @@ import urllib
 import urllib.request
 from pathlib import Path
 
+import numpy as np
+
 import bilby
 
 CHECKPOINT_EXIT_CODE = 77
@@ -115,7 +117,9 @@ class DataDump(object):
 
     def to_pickle(self):
         with open(self.filename, "wb+") as file:
-            pickle.dump(self, file)
+            # Protocol 4 supports large arrays and can be read by Python 3.4+,
+            # so data dumps stay readable across the supported environments
+            pickle.dump(self, file, protocol=4)
 
     @classmethod
     def from_pickle(cls, filename=None):
@@ -281,10 +285,13 @@ def check_directory_exists_and_if_not_mkdir(directory):
         Name of the directory
 
     """
-    if not os.path.exists(directory):
+    # Attempt the creation directly rather than checking first: this is a
+    # single filesystem call and is safe if another process creates the
+    # directory concurrently
+    try:
         os.makedirs(directory)
         logger.debug(f"Making directory {directory}")
-    else:
+    except FileExistsError:
         logger.debug(f"Directory {directory} exists")
 
 
@@ -475,14 +482,14 @@ def convert_string_to_list(string):
     return new_list
 
 
+# Translation table for sanitize_string_for_list: commas become spaces, while
+# brackets and quotes are removed, in a single pass over the string
+_LIST_STRING_TRANSLATION = str.maketrans({",": " ", "[": "", "]": "", '"': "", "'": ""})
+
+
 def sanitize_string_for_list(string):
-    string = string.replace(",", " ")
-    string = string.replace("[", "")
-    string = string.replace("]", "")
-    string = string.replace('"', "")
-    string = string.replace("'", "")
-    string_list = string.split()
-    return string_list
+    """ Converts strings such as "[H1, 'L1']" to a list, e.g. ["H1", "L1"] """
+    return string.translate(_LIST_STRING_TRANSLATION).split()
 
 
 def convert_dict_values_if_possible(dic):
@@ -619,8 +626,9 @@ def get_geocent_time_with_uncertainty(geocent_time, uncertainty):
     geocent time + uncertainty.
 
     """
-    geocent_time_prior = get_time_prior(geocent_time, uncertainty)
-    return geocent_time_prior.sample()
+    # Equivalent to get_time_prior(geocent_time, uncertainty).sample(), but
+    # without constructing a prior object for a single draw
+    return np.random.uniform(geocent_time - uncertainty, geocent_time + uncertainty)
 
 
 def convert_detectors_input(string):
@@ -643,19 +651,11 @@ def convert_detectors_input(string):
         string = ",".join(string)
     if isinstance(string, str) is False:
         raise BilbyPipeError(f"Detector input {string} not understood")
-    # Remove square brackets
-    string = string.replace("[", "").replace("]", "")
-    # Remove added quotes
-    string = strip_quotes(string)
-    # Replace multiple spaces with a single space
-    string = " ".join(string.split())
-    # Spaces can be either space or comma in input, convert to comma
-    string = string.replace(" ,", ",").replace(", ", ",").replace(" ", ",")
-
-    detectors = string.split(",")
-
+    # Brackets and quotes are dropped, spaces and commas both separate detectors
+    detectors = string.translate(_LIST_STRING_TRANSLATION).upper().split()
+    if len(detectors) == 0:
+        raise BilbyPipeError(f"Detector input {string} not understood")
     detectors.sort()
-    detectors = [det.upper() for det in detectors]
     return detectors
 
 
@@ -97,7 +97,7 @@ setup(
         "gwpy",
         "gwosc",
         "matplotlib",
-        "numpy",
+        "numpy>=1.17",
         "tqdm",
         "corner",
         "dynesty>=1.0.0",
@@ -1,13 +1,21 @@
 import os
 import shutil
+import sys
 import unittest
 
+import mock
 import numpy as np
+import pandas as pd
 
 import bilby_pipe
 from bilby_pipe.input import Input
 from bilby_pipe.utils import BilbyPipeError, parse_args
 
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 
 class TestParser(unittest.TestCase):
     def test_parser_defaults(self):
@@ -49,6 +57,15 @@ class TestParser(unittest.TestCase):
 
         self.assertEqual(args.extension, "json")
 
+    def test_parser_cached(self):
+        parser = bilby_pipe.create_injections.create_parser()
+        self.assertIs(parser, bilby_pipe.create_injections.create_parser())
+        fresh_parser = bilby_pipe.create_injections.create_parser(fresh=True)
+        self.assertIsNot(parser, fresh_parser)
+        fresh_parser.add_argument("--extra", default=None)
+        args, _ = parse_args(["4s", "-n", "1"], parser)
+        self.assertFalse(hasattr(args, "extra"))
+
 
 class TestCreateInjections(unittest.TestCase):
     def setUp(self):
@@ -109,6 +126,117 @@ class TestCreateInjections(unittest.TestCase):
         df = Input.read_json_injection_file(actual_filename)
         self.assertEqual(len(df), n_injection)
 
+    def test_write_injection_samples_dat(self):
+        np.random.seed(42)
+        samples = dict(a=np.random.uniform(0, 1, 4), b=np.random.normal(0, 1, 4))
+        filename = f"{self.outdir}/injections"
+        bilby_pipe.create_injections.InjectionCreator.write_injection_samples(
+            samples, filename, "dat"
+        )
+        # The default pandas float parser is not round-trip, so read back
+        # exactly to check the written values
+        df = pd.read_csv(
+            filename + ".dat", delim_whitespace=True, float_precision="round_trip"
+        )
+        self.assertEqual(list(df.columns), ["a", "b"])
+        for key in samples:
+            np.testing.assert_array_equal(df[key].values, samples[key])
+
+    def test_write_dat_fast_partial_block(self):
+        np.random.seed(42)
+        samples = dict(a=np.random.uniform(0, 1, 7), b=np.random.normal(0, 1, 7))
+        os.makedirs(self.outdir, exist_ok=True)
+        filename = f"{self.outdir}/injections.dat"
+        keys, data = bilby_pipe.create_injections._stage_samples(samples)
+        self.assertEqual(data.shape, (2, 7))
+        bilby_pipe.create_injections._write_dat_fast(filename, keys, data, block_size=3)
+        df = pd.read_csv(filename, delim_whitespace=True, float_precision="round_trip")
+        for key in samples:
+            np.testing.assert_array_equal(df[key].values, samples[key])
+
+    def test_write_dat_fast_shortest_repr(self):
+        samples = dict(a=np.array([0.7189110515725545, 0.1]), b=np.array([1e-05, 2.0]))
+        os.makedirs(self.outdir, exist_ok=True)
+        filename = f"{self.outdir}/injections.dat"
+        bilby_pipe.create_injections._write_dat_fast(
+            filename, *bilby_pipe.create_injections._stage_samples(samples)
+        )
+        with open(filename, "r") as file:
+            self.assertEqual(file.read(), "a b\n0.7189110515725545 1e-05\n0.1 2.0\n")
+
+    def test_write_non_numeric_injection_samples(self):
+        samples = dict(a=np.array([0.5, 1.5]), b=np.array([1, 2]), c=["x", "y z"])
+        filename = f"{self.outdir}/injections"
+        for extension in ["dat", "json"]:
+            bilby_pipe.create_injections.InjectionCreator.write_injection_samples(
+                samples, filename, extension
+            )
+            df = Input.read_injection_file(f"{filename}.{extension}")
+            self.assertEqual(list(df.columns), ["a", "b", "c"])
+            np.testing.assert_array_equal(df["a"].values, samples["a"])
+            np.testing.assert_array_equal(df["b"].values, samples["b"])
+            self.assertEqual(list(df["c"].values), samples["c"])
+
+    def test_stage_non_numeric_samples(self):
+        samples = dict(a=np.random.uniform(0, 1, 2), b=np.array(["x", "y"]))
+        self.assertIsNone(bilby_pipe.create_injections._stage_samples(samples))
+
+    def test_write_injection_samples_json(self):
+        samples = dict(a=np.random.uniform(0, 1, 4), b=np.random.normal(0, 1, 4))
+        filename = f"{self.outdir}/injections"
+        for orjson in [bilby_pipe.create_injections.orjson, None]:
+            with mock.patch("bilby_pipe.create_injections.orjson", orjson):
+                bilby_pipe.create_injections.InjectionCreator.write_injection_samples(
+                    samples, filename, "json"
+                )
+            df = Input.read_json_injection_file(filename + ".json")
+            self.assertEqual(list(df.columns), ["a", "b"])
+            for key in samples:
+                np.testing.assert_array_equal(df[key].values, samples[key])
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_create_injection_file_arrow_ext(self):
+        filename = f"{self.outdir}/injections"
+        for extension in ["parquet", "feather"]:
+            bilby_pipe.create_injections.create_injection_file(
+                filename,
+                3,
+                prior_file=self.example_prior_file,
+                generation_seed=123,
+                extension=extension,
+            )
+            df = Input.read_injection_file(f"{filename}.{extension}")
+            self.assertEqual(len(df), 3)
+            self.assertIn("mass_ratio", df.columns)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow not installed")
+    def test_main_extension(self):
+        os.makedirs(self.outdir, exist_ok=True)
+        filename = f"{self.outdir}/injections"
+        argv = [
+            "bilby_pipe_create_injection_file",
+            self.example_prior_file,
+            "-n",
+            "3",
+            "-e",
+            "parquet",
+            "-f",
+            filename,
+        ]
+        with mock.patch.object(sys, "argv", argv):
+            bilby_pipe.create_injections.main()
+        self.assertTrue(os.path.isfile(f"{filename}.parquet"))
+        self.assertFalse(os.path.isfile(f"{filename}.dat"))
+        self.assertEqual(len(Input.read_injection_file(f"{filename}.parquet")), 3)
+
+    def test_write_arrow_without_pyarrow(self):
+        samples = dict(a=np.random.uniform(0, 1, 4))
+        with mock.patch.dict(sys.modules, {"pyarrow": None}):
+            with self.assertRaises(BilbyPipeError):
+                bilby_pipe.create_injections.InjectionCreator.write_injection_samples(
+                    samples, f"{self.outdir}/injections", "parquet"
+                )
+
     def test_create_injection_file_with_gps_file(self):
         filename = f"{self.outdir}/injections"
         prior_file = self.example_prior_file
@@ -133,6 +261,88 @@ class TestCreateInjections(unittest.TestCase):
             df["geocenter_times"].iloc[0] / 100, gps_vals[0] / 100, places=1
         )
 
+    def test_injection_samples_geocenter_times_with_gps_file(self):
+        creator = bilby_pipe.create_injections.InjectionCreator(
+            prior_file=self.example_prior_file,
+            prior_dict=None,
+            default_prior="BBHPriorDict",
+            trigger_time=0,
+            n_injection=None,
+            generation_seed=123,
+            gps_file="tests/gps_file.txt",
+            deltaT=0.2,
+        )
+        trigger_times = np.loadtxt("tests/gps_file.txt") + 4 - 2
+        samplesA = creator.get_injection_samples()
+        samplesB = creator.get_injection_samples()
+        self.assertTrue(
+            np.all(np.abs(samplesA["geocenter_times"] - trigger_times) <= 0.1)
+        )
+        np.testing.assert_array_equal(
+            samplesA["geocenter_times"], samplesB["geocenter_times"]
+        )
+
+    @mock.patch("bilby_pipe.create_injections.PARALLEL_SAMPLING_CHUNK_SIZE", 4)
+    def test_injection_samples_in_chunks(self):
+        samples = []
+        for n_processes in [2, 3]:
+            creator = bilby_pipe.create_injections.InjectionCreator(
+                prior_file=self.example_prior_file,
+                prior_dict=None,
+                default_prior="BBHPriorDict",
+                trigger_time=0,
+                n_injection=10,
+                generation_seed=123,
+                gps_file=None,
+                n_processes=n_processes,
+            )
+            samples.append(creator.get_injection_samples())
+        self.assertEqual(len(samples[0]["mass_ratio"]), 10)
+        for key in samples[0]:
+            np.testing.assert_array_equal(samples[0][key], samples[1][key])
+
+    @mock.patch("bilby_pipe.create_injections.PARALLEL_SAMPLING_CHUNK_SIZE", 4)
+    def test_injection_samples_serial_not_chunked(self):
+        creator = bilby_pipe.create_injections.InjectionCreator(
+            prior_file=self.example_prior_file,
+            prior_dict=None,
+            default_prior="BBHPriorDict",
+            trigger_time=0,
+            n_injection=10,
+            generation_seed=123,
+            gps_file=None,
+        )
+        self.assertFalse(creator.sample_in_chunks)
+        np.random.seed(123)
+        samplesA = creator.get_injection_samples()
+        np.random.seed(123)
+        samplesB = creator.priors.sample(10)
+        for key in samplesB:
+            np.testing.assert_array_equal(samplesA[key], samplesB[key])
+
+    @mock.patch("bilby_pipe.create_injections.PARALLEL_SAMPLING_CHUNK_SIZE", 4)
+    def test_create_injection_file_dat_in_chunks(self):
+        creator = bilby_pipe.create_injections.InjectionCreator(
+            prior_file=self.example_prior_file,
+            prior_dict=None,
+            default_prior="BBHPriorDict",
+            trigger_time=0,
+            n_injection=10,
+            generation_seed=123,
+            gps_file=None,
+            n_processes=2,
+        )
+        filename = f"{self.outdir}/injections"
+        creator.generate_injection_file(filename + "_A", "dat")
+        creator.write_injection_samples(
+            creator.sample_priors_in_chunks(), filename + "_B", "dat"
+        )
+        with open(filename + "_A.dat", "r") as file:
+            contents = file.read()
+        with open(filename + "_B.dat", "r") as file:
+            self.assertEqual(contents, file.read())
+        self.assertEqual(len(Input.read_dat_injection_file(filename + "_A.dat")), 10)
+
     def test_create_injection_file_json(self):
         filename = f"{self.outdir}/injections.json"
         prior_file = self.example_prior_file
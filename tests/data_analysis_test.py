@@ -2,6 +2,8 @@ import os
 import shutil
 import unittest
 
+import numpy as np
+
 import bilby
 from bilby_pipe.data_analysis import DataAnalysisInput, create_analysis_parser
 from bilby_pipe.main import parse_args
@@ -37,6 +39,14 @@ class TestDataAnalysisInput(unittest.TestCase):
         inputs = DataAnalysisInput(*parse_args(args_list, self.parser), test=True)
         self.assertEqual(inputs.sampling_seed, 1)
 
+    def test_unset_sampling_seed_independent_of_global_state(self):
+        args, unknown_args = parse_args(self.default_args_list, self.parser)
+        np.random.seed(1)
+        inputsA = DataAnalysisInput(args, unknown_args, test=True)
+        np.random.seed(1)
+        inputsB = DataAnalysisInput(args, unknown_args, test=True)
+        self.assertNotEqual(inputsA.sampling_seed, inputsB.sampling_seed)
+
     def test_set_sampler_ini(self):
         self.inputs = DataAnalysisInput(
             *parse_args(self.default_args_list, self.parser), test=True
@@ -67,6 +77,10 @@ class TestDataAnalysisInput(unittest.TestCase):
         self.inputs.sampler_kwargs = "{'a':5, 'b':5}"
         self.assertEqual(self.inputs.sampler_kwargs, dict(a=5, b=5))
 
+    def test_set_sampling_kwargs_json(self):
+        self.inputs.sampler_kwargs = '{"nlive": 500, "dlogz": 0.1, "a": "1"}'
+        self.assertEqual(self.inputs.sampler_kwargs, dict(nlive=500, dlogz=0.1, a=1))
+
     def test_unset_sampling_kwargs(self):
         args, unknown_args = parse_args(self.default_args_list, self.parser)
         args.sampler_kwargs = None
@@ -95,6 +109,14 @@ class TestDataAnalysisInput(unittest.TestCase):
         with self.assertRaises(BilbyPipeError):
             print(self.inputs.bilby_frequency_domain_source_model)
 
+    def test_setting_priors_resets_likelihood(self):
+        self.inputs._likelihood = "cached-likelihood"
+        self.assertEqual(self.inputs.likelihood, "cached-likelihood")
+        priors = bilby.core.prior.PriorDict()
+        self.inputs.priors = priors
+        self.assertEqual(self.inputs.priors, priors)
+        self.assertFalse(hasattr(self.inputs, "_likelihood"))
+
 
 if __name__ == "__main__":
     unittest.main()
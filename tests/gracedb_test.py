@@ -47,6 +47,12 @@ class TestGraceDB(unittest.TestCase):
         new_cert_path = os.path.join(self.outdir, "." + CERT_ALIAS)
 
         self.assertEqual(out, new_cert_path)
+        with open(out, "r") as file:
+            self.assertEqual(file.read(), "this is a test")
+
+        # a stale proxy in the outdir is replaced
+        out = gracedb.x509userproxy(outdir=self.outdir)
+        self.assertEqual(out, new_cert_path)
 
     def test_x509userproxy_no_cert(self):
         """
@@ -62,6 +68,18 @@ class TestGraceDB(unittest.TestCase):
         out = gracedb.x509userproxy(outdir=self.outdir)
         self.assertEqual(out, None)
 
+    def test_x509userproxy_missing_cert_keeps_existing(self):
+        cert_alias_path = os.path.join(self.cert_dummy_path, CERT_ALIAS)
+        existing_cert_path = os.path.join(self.outdir, "." + CERT_ALIAS)
+        with open(existing_cert_path, "w") as file:
+            file.write("existing proxy")
+        os.environ[CERT_ALIAS] = cert_alias_path
+
+        out = gracedb.x509userproxy(outdir=self.outdir)
+        self.assertEqual(out, None)
+        with open(existing_cert_path, "r") as file:
+            self.assertEqual(file.read(), "existing proxy")
+
     # def test_read_from_gracedb(self):
     #    uid = "G298936"
     #    gracedb_url = 'https://gracedb.ligo.org/api/'
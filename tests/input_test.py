@@ -1,13 +1,21 @@
 import os
+import shutil
 import unittest
 from shutil import copyfile
 
+import mock
+import numpy as np
 import pandas as pd
 
 import bilby
 import bilby_pipe
 from bilby_pipe.utils import BilbyPipeError, BilbyPipeInternalError
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 
 class TestInput(unittest.TestCase):
     def setUp(self):
@@ -72,6 +80,9 @@ class TestInput(unittest.TestCase):
         with self.assertRaises(BilbyPipeError):
             inputs.detectors = ["G1", "L1"]
 
+        with self.assertRaisesRegex(BilbyPipeError, "'G1', 'K1'"):
+            inputs.detectors = ["G1", "K1", "L1"]
+
         inputs.known_detectors = inputs.known_detectors + ["G1"]
         inputs.detectors = ["G1", "L1"]
         self.assertEqual(inputs.detectors, ["G1", "L1"])
@@ -105,6 +116,90 @@ class TestInput(unittest.TestCase):
         self.assertEqual(inputs.gps_file, os.path.relpath(self.test_gps_file))
         self.assertEqual(len(inputs.read_gps_file()), 2)
 
+    def test_read_numeric_text_file_large(self):
+        directory = "tests/temp_text_files"
+        os.makedirs(directory, exist_ok=True)
+        self.addCleanup(shutil.rmtree, directory)
+        filename = f"{directory}/gps_file.txt"
+        with open(filename, "w") as ff:
+            ff.write("# gps times\n1126259462.413,1\n1126259466.0123456789,2\n")
+        copyfile(self.test_gps_file, f"{directory}/gps.txt")
+        copyfile("tests/timeslides.txt", f"{directory}/timeslides.txt")
+        cache_directory = f"{directory}/cache"
+        for files in [f"{directory}/gps.txt", f"{directory}/timeslides.txt", filename]:
+            delimiter = None if "timeslides" in files else ","
+            expected = np.loadtxt(files, ndmin=2, delimiter=delimiter)
+            for has_c_loadtxt in [True, False]:
+                with mock.patch("bilby_pipe.input.LOADTXT_MAXIMUM_FILE_SIZE", 0):
+                    with mock.patch(
+                        "bilby_pipe.input.NUMPY_HAS_C_LOADTXT", has_c_loadtxt
+                    ), mock.patch(
+                        "bilby_pipe.input.NUMERIC_TEXT_FILE_CACHE_DIRECTORY",
+                        cache_directory,
+                    ):
+                        array = bilby_pipe.input.Input.read_numeric_text_file(
+                            files, delimiter=delimiter
+                        )
+                shutil.rmtree(cache_directory)
+                np.testing.assert_array_equal(array, expected)
+
+    def test_read_numeric_text_file_cache(self):
+        directory = "tests/temp_text_files"
+        os.makedirs(directory, exist_ok=True)
+        self.addCleanup(shutil.rmtree, directory)
+        cache_directory = f"{directory}/cache"
+        filename = f"{directory}/gps_file.txt"
+        with open(filename, "w") as ff:
+            ff.write("1126259462.413\n1126259466\n")
+        with mock.patch("bilby_pipe.input.LOADTXT_MAXIMUM_FILE_SIZE", 0), mock.patch(
+            "bilby_pipe.input.NUMERIC_TEXT_FILE_CACHE_DIRECTORY", cache_directory
+        ):
+            array = bilby_pipe.input.Input.read_numeric_text_file(filename)
+            # The cache is moved into place in the cache directory, leaving no
+            # temporary files behind and nothing next to the file
+            self.assertEqual(sorted(os.listdir(directory)), ["cache", "gps_file.txt"])
+            caches = os.listdir(cache_directory)
+            self.assertEqual(len(caches), 1)
+            cache = f"{cache_directory}/{caches[0]}"
+            np.save(cache, 2 * array)
+            np.testing.assert_array_equal(
+                bilby_pipe.input.Input.read_numeric_text_file(filename), 2 * array
+            )
+
+            # An unreadable cache is ignored
+            with open(cache, "w") as ff:
+                ff.write("not an array")
+            np.testing.assert_array_equal(
+                bilby_pipe.input.Input.read_numeric_text_file(filename), array
+            )
+
+            # A modified file invalidates the cache
+            with open(filename, "w") as ff:
+                ff.write("1\n2\n")
+            mtime = os.path.getmtime(cache) + 10
+            os.utime(filename, (mtime, mtime))
+            np.testing.assert_array_equal(
+                bilby_pipe.input.Input.read_numeric_text_file(filename), [[1], [2]]
+            )
+
+    def test_read_numeric_text_file_cache_not_writable(self):
+        directory = "tests/temp_text_files"
+        os.makedirs(directory, exist_ok=True)
+        self.addCleanup(shutil.rmtree, directory)
+        filename = f"{directory}/gps_file.txt"
+        with open(filename, "w") as ff:
+            ff.write("1126259462.413\n1126259466\n")
+        # A file in place of the cache directory makes the cache unwritable
+        cache_directory = f"{directory}/cache"
+        open(cache_directory, "w").close()
+        with mock.patch("bilby_pipe.input.LOADTXT_MAXIMUM_FILE_SIZE", 0), mock.patch(
+            "bilby_pipe.input.NUMERIC_TEXT_FILE_CACHE_DIRECTORY", cache_directory
+        ):
+            np.testing.assert_array_equal(
+                bilby_pipe.input.Input.read_numeric_text_file(filename),
+                [[1126259462.413], [1126259466]],
+            )
+
     def test_gps_file_set_fail(self):
         inputs = bilby_pipe.main.Input()
         gps_file = "tests/nonexistant_file.txt"
@@ -124,6 +219,45 @@ class TestInput(unittest.TestCase):
             bilby.gw.source.lal_binary_black_hole,
         )
 
+    def test_parameter_generation(self):
+        inputs = bilby_pipe.main.Input()
+        inputs.frequency_domain_source_model = "lal_binary_neutron_star"
+        self.assertEqual(
+            inputs.parameter_generation,
+            bilby.gw.conversion.generate_all_bns_parameters,
+        )
+        inputs.frequency_domain_source_model = (
+            "lal_eccentric_binary_black_hole_no_spins"
+        )
+        self.assertEqual(
+            inputs.parameter_generation,
+            bilby.gw.conversion.generate_all_bbh_parameters,
+        )
+        inputs.frequency_domain_source_model = "sinegaussian"
+        self.assertIsNone(inputs.parameter_generation)
+        self.assertIsNone(inputs.parameter_conversion)
+
+    def test_frequency_domain_source_model_to_bilby_reused(self):
+        inputs = bilby_pipe.main.Input()
+        inputs.frequency_domain_source_model = "lal_binary_black_hole"
+        with mock.patch("bilby_pipe.input.import_module") as import_module:
+            inputs.frequency_domain_source_model = "numpy.sum"
+            self.assertIs(
+                inputs.bilby_frequency_domain_source_model,
+                import_module.return_value.sum,
+            )
+            inputs.bilby_frequency_domain_source_model
+            self.assertEqual(import_module.call_count, 1)
+        inputs.frequency_domain_source_model = "lal_binary_neutron_star"
+        self.assertEqual(
+            inputs.bilby_frequency_domain_source_model,
+            bilby.gw.source.lal_binary_neutron_star,
+        )
+        self.assertEqual(
+            inputs.bilby_roq_frequency_domain_source_model,
+            bilby.gw.source.binary_neutron_star_roq,
+        )
+
     def test_frequency_domain_source_model_to_bilby_fail(self):
         inputs = bilby_pipe.main.Input()
         inputs.frequency_domain_source_model = "not_a_source_model"
@@ -197,12 +331,41 @@ class TestInput(unittest.TestCase):
         self.assertEqual(inputs.maximum_frequency, 200.1)
         self.assertEqual(inputs.maximum_frequency_dict, dict(H1=100.1, L1=200.1))
 
+    def test_calibration_prior_constant_uncertainty(self):
+        inputs = bilby_pipe.main.Input()
+        inputs.detectors = "H1 L1"
+        inputs.minimum_frequency = 20
+        inputs.maximum_frequency = 1024
+        inputs.calibration_model = "CubicSpline"
+        inputs.spline_calibration_nodes = 4
+        inputs.spline_calibration_envelope_dict = None
+        inputs.spline_calibration_amplitude_uncertainty_dict = "{H1: 0.1}"
+        inputs.spline_calibration_phase_uncertainty_dict = "{H1: 0.2}"
+        priors = inputs.calibration_prior
+        self.assertIn("recalib_H1_amplitude_0", priors)
+        self.assertEqual(priors["recalib_H1_phase_0"].sigma, 0.2)
+        self.assertFalse(any("L1" in key for key in priors))
+
     def test_default_webdir(self):
         inputs = bilby_pipe.main.Input()
         inputs.outdir = "results"
         inputs.webdir = None
         self.assertEqual(inputs.webdir, "results/results_page")
 
+    def test_directories_checked_once(self):
+        inputs = bilby_pipe.main.Input()
+        inputs.outdir = "tests/temp_directories"
+        self.addCleanup(shutil.rmtree, "tests/temp_directories")
+        with mock.patch(
+            "bilby_pipe.utils.check_directory_exists_and_if_not_mkdir",
+            wraps=bilby_pipe.utils.check_directory_exists_and_if_not_mkdir,
+        ) as check:
+            for _ in range(3):
+                self.assertEqual(inputs.data_directory, "tests/temp_directories/data")
+                self.assertEqual(inputs.outdir, "tests/temp_directories")
+            self.assertEqual(check.call_count, 2)
+        self.assertTrue(os.path.isdir("tests/temp_directories/data"))
+
     def test_default_start_time(self):
         inputs = bilby_pipe.main.Input()
         inputs.trigger_time = 2
@@ -210,6 +373,15 @@ class TestInput(unittest.TestCase):
         inputs.duration = 4
         self.assertEqual(inputs.start_time, 0)
 
+    def test_default_start_time_follows_trigger_time(self):
+        inputs = bilby_pipe.main.Input()
+        inputs.trigger_time = 2
+        inputs.post_trigger_duration = 2
+        inputs.duration = 4
+        self.assertEqual(inputs.start_time, 0)
+        inputs.trigger_time = 6
+        self.assertEqual(inputs.start_time, 4)
+
     def test_set_start_time(self):
         inputs = bilby_pipe.main.Input()
         inputs.start_time = 2
@@ -414,12 +586,115 @@ class TestInput(unittest.TestCase):
             inputs.frequency_domain_source_model = "unknown"
             inputs.bilby_roq_frequency_domain_source_model
 
+    def test_roq_likelihood_kwargs_loaded_once(self):
+        roq_folder = "tests/temp_roq"
+        os.makedirs(roq_folder, exist_ok=True)
+        self.addCleanup(shutil.rmtree, roq_folder)
+        with open(f"{roq_folder}/params.dat", "w") as ff:
+            ff.write("flow fhigh seglen\n20 1024 4\n")
+        weight_file = f"{roq_folder}/weights.npz"
+        np.savez(weight_file, time_samples=np.arange(3.0))
+
+        inputs = bilby_pipe.main.Input()
+        inputs.roq_folder = roq_folder
+        inputs.roq_scale_factor = 1
+        inputs.meta_data = dict(weight_file=weight_file)
+        kwargs = inputs.roq_likelihood_kwargs
+        self.assertEqual(kwargs["roq_params"]["seglen"], 4)
+        np.testing.assert_array_equal(kwargs["weights"]["time_samples"], np.arange(3.0))
+
+        os.remove(weight_file)
+        os.remove(f"{roq_folder}/params.dat")
+        self.assertIs(inputs.roq_likelihood_kwargs["weights"], kwargs["weights"])
+
+    def test_read_roq_frequency_nodes_cached(self):
+        roq_folder = "tests/temp_roq"
+        os.makedirs(roq_folder, exist_ok=True)
+        self.addCleanup(shutil.rmtree, roq_folder)
+        np.save(f"{roq_folder}/fnodes_linear.npy", np.arange(3.0))
+        np.save(f"{roq_folder}/fnodes_quadratic.npy", np.arange(2.0))
+        linear, quadratic = bilby_pipe.input.read_roq_frequency_nodes(roq_folder, 2)
+        np.testing.assert_array_equal(linear, [0, 2, 4])
+        np.testing.assert_array_equal(quadratic, [0, 2])
+        self.assertFalse(linear.flags.writeable)
+        self.assertNotIsInstance(linear, np.memmap)
+        self.assertIs(
+            bilby_pipe.input.read_roq_frequency_nodes(roq_folder, 2)[0], linear
+        )
+
+        np.save(f"{roq_folder}/fnodes_linear.npy", np.arange(4.0))
+        mtime = os.path.getmtime(f"{roq_folder}/fnodes_linear.npy") + 10
+        os.utime(f"{roq_folder}/fnodes_linear.npy", (mtime, mtime))
+        linear, _ = bilby_pipe.input.read_roq_frequency_nodes(roq_folder, 2)
+        np.testing.assert_array_equal(linear, [0, 2, 4, 6])
+
+    def test_read_prior_file_cached(self):
+        prior_file = "tests/temp_prior_file.prior"
+        self.addCleanup(os.remove, prior_file)
+        with open(prior_file, "w") as ff:
+            ff.write("mass_ratio = Uniform(0.125, 1)\n")
+        priorsA = bilby_pipe.input.read_prior_file(
+            bilby.core.prior.PriorDict, prior_file
+        )
+        priorsB = bilby_pipe.input.read_prior_file(
+            bilby.core.prior.PriorDict, prior_file
+        )
+        self.assertEqual(priorsA, priorsB)
+        self.assertIsNot(priorsA["mass_ratio"], priorsB["mass_ratio"])
+
+        with open(prior_file, "w") as ff:
+            ff.write("mass_ratio = Uniform(0.5, 1)\n")
+        mtime = os.path.getmtime(prior_file) + 10
+        os.utime(prior_file, (mtime, mtime))
+        priorsC = bilby_pipe.input.read_prior_file(
+            bilby.core.prior.PriorDict, prior_file
+        )
+        self.assertEqual(priorsC["mass_ratio"].minimum, 0.5)
+
+    def test_read_roq_params_file(self):
+        filename = "tests/temp_params.dat"
+        self.addCleanup(os.remove, filename)
+        for contents in [
+            "flow fhigh seglen\n20 1024 4\n",
+            "a b\n1 2.5\n3 4\n",
+            "# flow fhigh seglen\n20 1024 4\n",
+            "#a b\n1 2.5 # comment\n# comment\n3 4\n",
+        ]:
+            with open(filename, "w") as ff:
+                ff.write(contents)
+            expected = np.genfromtxt(filename, names=True)
+            params = bilby_pipe.input.Input.read_roq_params_file(filename)
+            self.assertEqual(params.dtype, expected.dtype)
+            self.assertEqual(params.shape, expected.shape)
+            np.testing.assert_array_equal(params, expected)
+
     def test_default_prior_files(self):
         inputs = bilby_pipe.main.Input()
         self.assertEqual(inputs.get_default_prior_files(), inputs.default_prior_files)
         self.assertTrue(isinstance(inputs.default_prior_files, dict))
         self.assertTrue("4s" in inputs.default_prior_files)
         self.assertTrue("128s" in inputs.default_prior_files)
+        inputs.default_prior_files.pop("4s")
+        self.assertTrue("4s" in inputs.default_prior_files)
+
+    def test_combined_default_prior_dicts(self):
+        inputs = bilby_pipe.main.Input()
+        prior_dicts = inputs.combined_default_prior_dicts
+        self.assertIs(prior_dicts["BBHPriorDict"], bilby.gw.prior.BBHPriorDict)
+        self.assertIs(prior_dicts["PriorDict"], bilby.core.prior.PriorDict)
+        self.assertIs(prior_dicts["__name__"], bilby.gw.prior.__name__)
+        with mock.patch.object(bilby.gw.prior, "NewPriorDict", "new", create=True):
+            self.assertEqual(prior_dicts["NewPriorDict"], "new")
+
+    def test_combined_default_prior_dicts_read_only(self):
+        inputs = bilby_pipe.main.Input()
+        prior_dicts = inputs.combined_default_prior_dicts
+        with self.assertRaises(TypeError):
+            prior_dicts["NewPriorDict"] = None
+        with self.assertRaises(TypeError):
+            del prior_dicts["BBHPriorDict"]
+        self.assertFalse(hasattr(bilby.gw.prior, "NewPriorDict"))
+        self.assertTrue(hasattr(bilby.gw.prior, "BBHPriorDict"))
 
     def test_default_prior_files_lookups(self):
         inputs = bilby_pipe.main.Input()
@@ -531,6 +806,101 @@ class TestInput(unittest.TestCase):
         with self.assertRaises(BilbyPipeError):
             inputs.injection_numbers = ["a"]
 
+    def test_read_json_injection_file_without_orjson(self):
+        df = bilby_pipe.main.Input.read_json_injection_file(
+            self.test_injection_file_json
+        )
+        with mock.patch("bilby_pipe.input.orjson", None):
+            df_json = bilby_pipe.main.Input.read_json_injection_file(
+                self.test_injection_file_json
+            )
+        pd.testing.assert_frame_equal(df, df_json)
+
+    def test_read_json_injection_file_with_nan(self):
+        directory = "tests/temp_injection_files"
+        os.makedirs(directory, exist_ok=True)
+        self.addCleanup(shutil.rmtree, directory)
+        filename = f"{directory}/injections.json"
+        with open(filename, "w") as file:
+            file.write('{"injections": {"a": [1.0, NaN], "b": [2.0, 3.0]}}')
+        df = bilby_pipe.main.Input.read_json_injection_file(filename)
+        self.assertTrue(np.isnan(df["a"].values[1]))
+        self.assertEqual(list(df["b"].values), [2.0, 3.0])
+
+    @unittest.skipIf(ijson is None, "ijson not installed")
+    def test_read_json_injection_file_streaming(self):
+        directory = "tests/temp_injection_files"
+        os.makedirs(directory, exist_ok=True)
+        self.addCleanup(shutil.rmtree, directory)
+        filename = f"{directory}/injections.json"
+        with open(filename, "w") as file:
+            file.write(
+                '{"injections": {"a": [1.0, 2.5], "b": [1, 2], "c": ["x", "y"], '
+                '"d": [{"__complex__": true, "real": 1, "imag": 2}, 1.0]}}'
+            )
+        nan_filename = f"{directory}/nan_injections.json"
+        with open(nan_filename, "w") as file:
+            file.write('{"injections": {"a": [1.0, NaN]}}')
+        for injection_file in [self.test_injection_file_json, filename, nan_filename]:
+            expected = bilby_pipe.main.Input.read_json_injection_file(injection_file)
+            with mock.patch("bilby_pipe.input.JSON_STREAMING_MINIMUM_FILE_SIZE", 0):
+                df = bilby_pipe.main.Input.read_json_injection_file(injection_file)
+            pd.testing.assert_frame_equal(df, expected)
+        self.assertEqual(df["a"].values[0], 1.0)
+        columns = bilby_pipe.input._stream_json_injection_columns(filename)
+        self.assertEqual(columns["a"].dtype, np.float64)
+        self.assertEqual(columns["d"][0], 1 + 2j)
+        self.assertIsNone(bilby_pipe.input._stream_json_injection_columns(nan_filename))
+
+    def test_read_json_injection_file_streaming_unsupported(self):
+        with mock.patch(
+            "bilby_pipe.input.JSON_STREAMING_MINIMUM_FILE_SIZE", 0
+        ), mock.patch("bilby_pipe.input.IJSON_SUPPORTS_STREAMING", False), mock.patch(
+            "bilby_pipe.input._stream_json_injection_columns"
+        ) as stream:
+            df = bilby_pipe.main.Input.read_json_injection_file(
+                self.test_injection_file_json
+            )
+        stream.assert_not_called()
+        self.assertEqual(len(df), 1)
+
+    def test_read_json_injection_file_single_injection(self):
+        directory = "tests/temp_injection_files"
+        os.makedirs(directory, exist_ok=True)
+        self.addCleanup(shutil.rmtree, directory)
+        filename = f"{directory}/injection.json"
+        with open(filename, "w") as file:
+            file.write('{"injections": {"a": 1.0, "b": "x"}}')
+        df = bilby_pipe.main.Input.read_json_injection_file(filename)
+        pd.testing.assert_frame_equal(df, pd.DataFrame(dict(a=[1.0], b=["x"])))
+
+    def test_read_dat_injection_file_commented_header(self):
+        directory = "tests/temp_injection_files"
+        os.makedirs(directory, exist_ok=True)
+        self.addCleanup(shutil.rmtree, directory)
+        filename = f"{directory}/injections.dat"
+        with open(self.test_injection_file_dat, "r") as file:
+            contents = file.read()
+        with open(filename, "w") as file:
+            file.write("# " + contents)
+        pd.testing.assert_frame_equal(
+            bilby_pipe.main.Input.read_dat_injection_file(filename),
+            bilby_pipe.main.Input.read_dat_injection_file(self.test_injection_file_dat),
+        )
+
+    def test_read_injection_file_extension(self):
+        directory = "tests/temp_injection_files"
+        os.makedirs(directory, exist_ok=True)
+        self.addCleanup(shutil.rmtree, directory)
+        filename = f"{directory}/jsondata.dat"
+        copyfile(self.test_injection_file_dat, filename)
+        df = bilby_pipe.main.Input.read_injection_file(filename)
+        pd.testing.assert_frame_equal(
+            df, bilby_pipe.main.Input.read_dat_injection_file(filename)
+        )
+        with self.assertRaises(BilbyPipeError):
+            bilby_pipe.main.Input.read_injection_file(f"{directory}/injections.txt")
+
     def test_injection_df_nonpandas(self):
         inputs = bilby_pipe.main.Input()
         with self.assertRaises(BilbyPipeError):
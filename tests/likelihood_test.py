@@ -0,0 +1,110 @@
+import unittest
+
+import mock
+import numpy as np
+
+import bilby
+import bilby_pipe.likelihood
+from bilby_pipe.likelihood import NumbaGravitationalWaveTransient
+
+
+def toy_source_model(frequency_array, amplitude, phase, ra, dec, psi, geocent_time):
+    """ A simple analytic source model with a power-law amplitude """
+    frequency_array = np.maximum(frequency_array, 1)
+    h_plus = amplitude * frequency_array ** (-7 / 6) * np.exp(1j * phase)
+    return dict(plus=h_plus, cross=1j * h_plus)
+
+
+class TestNumbaGravitationalWaveTransient(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(42)
+        self.parameters = dict(
+            amplitude=1e-21,
+            phase=1.3,
+            ra=1.375,
+            dec=-1.2108,
+            psi=2.659,
+            geocent_time=1126259642.413,
+        )
+        duration = 4.0
+        sampling_frequency = 1024.0
+        self.waveform_generator = bilby.gw.WaveformGenerator(
+            duration=duration,
+            sampling_frequency=sampling_frequency,
+            frequency_domain_source_model=toy_source_model,
+        )
+        self.interferometers = bilby.gw.detector.InterferometerList(["H1", "L1"])
+        self.interferometers.set_strain_data_from_power_spectral_densities(
+            sampling_frequency=sampling_frequency,
+            duration=duration,
+            start_time=self.parameters["geocent_time"] - 3,
+        )
+        self.interferometers.inject_signal(
+            waveform_generator=self.waveform_generator, parameters=self.parameters
+        )
+        self.priors = bilby.core.prior.PriorDict()
+        self.priors["phase"] = bilby.core.prior.Uniform(0, 2 * np.pi)
+        self.priors["geocent_time"] = bilby.core.prior.Uniform(
+            self.parameters["geocent_time"] - 0.1,
+            self.parameters["geocent_time"] + 0.1,
+        )
+
+    def get_likelihoods(self, **kwargs):
+        likelihoods = [
+            Likelihood(
+                interferometers=self.interferometers,
+                waveform_generator=self.waveform_generator,
+                priors=self.priors.copy(),
+                **kwargs,
+            )
+            for Likelihood in [
+                bilby.gw.likelihood.GravitationalWaveTransient,
+                NumbaGravitationalWaveTransient,
+            ]
+        ]
+        for likelihood in likelihoods:
+            likelihood.parameters.update(self.parameters)
+        return likelihoods
+
+    def test_log_likelihood_ratio(self):
+        bilby_likelihood, numba_likelihood = self.get_likelihoods()
+        self.assertAlmostEqual(
+            bilby_likelihood.log_likelihood_ratio(),
+            numba_likelihood.log_likelihood_ratio(),
+            places=6,
+        )
+
+    def test_log_likelihood_ratio_numpy_kernel(self):
+        bilby_likelihood, numba_likelihood = self.get_likelihoods()
+        with mock.patch(
+            "bilby_pipe.likelihood._inner_products",
+            bilby_pipe.likelihood._inner_products_numpy,
+        ):
+            self.assertAlmostEqual(
+                bilby_likelihood.log_likelihood_ratio(),
+                numba_likelihood.log_likelihood_ratio(),
+                places=6,
+            )
+
+    def test_log_likelihood_ratio_phase_marginalization(self):
+        bilby_likelihood, numba_likelihood = self.get_likelihoods(
+            phase_marginalization=True
+        )
+        self.assertAlmostEqual(
+            bilby_likelihood.log_likelihood_ratio(),
+            numba_likelihood.log_likelihood_ratio(),
+            places=6,
+        )
+
+    def test_log_likelihood_ratio_time_marginalization(self):
+        bilby_likelihood, numba_likelihood = self.get_likelihoods(
+            time_marginalization=True, jitter_time=False
+        )
+        self.assertEqual(
+            bilby_likelihood.log_likelihood_ratio(),
+            numba_likelihood.log_likelihood_ratio(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
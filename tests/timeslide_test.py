@@ -41,6 +41,15 @@ class TestTimeslide(unittest.TestCase):
             for idx, i in enumerate(inputs.timeslides[det]):
                 self.assertEqual(i, correct_timeslides[det][idx])
 
+    def test_get_timeslide_dict(self):
+        self.generate_ini(self.ini)
+        inputs = self.get_args_from_ini()
+        inputs.gps_file = self.gps_file
+        inputs.timeslide_file = self.timeslide_file
+        self.assertEqual(inputs.get_timeslide_dict(1), {"H1": 20, "L1": -20})
+        with self.assertRaises(BilbyPipeError):
+            inputs.get_timeslide_dict(3)
+
     def test_error_thrown_for_non_existant_timeslide_file(self):
         self.generate_ini(self.ini)
         inputs = self.get_args_from_ini()
@@ -1,5 +1,6 @@
 import logging
 import os
+import pickle
 import shutil
 import sys
 import unittest
@@ -142,6 +143,13 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(cstll("[['1', '2'], [2, 3]]"), [[1, 2], [2, 3]])
         self.assertEqual(cstll("[[[1], [2]], [2, 3]]"), [[[1], [2]], [2, 3]])
 
+    def test_sanitize_string_for_list(self):
+        sanitize = bilby_pipe.utils.sanitize_string_for_list
+        self.assertEqual(sanitize("[H1, 'L1']"), ["H1", "L1"])
+        self.assertEqual(sanitize('[["a",b],c]'), ["a", "b", "c"])
+        self.assertEqual(sanitize("a[b]c"), ["abc"])
+        self.assertEqual(sanitize(""), [])
+
     def test_convert_detectors_input(self):
         self.assertEqual(["H1"], bilby_pipe.utils.convert_detectors_input("H1"))
         self.assertEqual(["H1"], bilby_pipe.utils.convert_detectors_input("[H1]"))
@@ -177,6 +185,14 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(
             ["H1", "L1"], bilby_pipe.utils.convert_detectors_input(["L1", "H1"])
         )
+        self.assertEqual(
+            ["H1", "L1"], bilby_pipe.utils.convert_detectors_input("[H1,, L1]")
+        )
+        self.assertEqual(
+            ["H1", "K1"], bilby_pipe.utils.convert_detectors_input("[K1, h1]")
+        )
+        with self.assertRaises(bilby_pipe.utils.BilbyPipeError):
+            bilby_pipe.utils.convert_detectors_input("[]")
 
     def test_convert_prior_string_input_simpe(self):
         self.assertEqual(dict(a="1", b="2"), convert_prior_string_input("{a: 1, b:2}"))
@@ -208,6 +224,43 @@ class TestUtils(unittest.TestCase):
             ),
         )
 
+    def test_geocent_time_with_uncertainty(self):
+        np.random.seed(42)
+        expected = bilby_pipe.utils.get_time_prior(1126259462.4, 0.1).sample()
+        np.random.seed(42)
+        geocent_time = bilby_pipe.utils.get_geocent_time_with_uncertainty(
+            1126259462.4, 0.1
+        )
+        self.assertEqual(geocent_time, expected)
+        self.assertTrue(abs(geocent_time - 1126259462.4) <= 0.1)
+
+    def test_data_dump_round_trip(self):
+        data_dump = bilby_pipe.utils.DataDump(
+            label="label",
+            outdir=self.outdir,
+            trigger_time=1126259462.4,
+            likelihood_lookup_table=None,
+            likelihood_roq_weights=None,
+            likelihood_roq_params=None,
+            priors_dict=dict(mass_ratio=bilby.core.prior.Uniform(0.1, 1)),
+            priors_class=bilby.core.prior.PriorDict,
+            interferometers=None,
+            meta_data=dict(array=np.arange(10.0)),
+            idx=0,
+        )
+        data_dump.to_pickle()
+        loaded = bilby_pipe.utils.DataDump.from_pickle(data_dump.filename)
+        self.assertEqual(loaded.trigger_time, data_dump.trigger_time)
+        self.assertEqual(loaded.priors_dict, data_dump.priors_dict)
+        np.testing.assert_array_equal(loaded.meta_data["array"], np.arange(10.0))
+
+    def test_data_dump_wrong_type(self):
+        filename = os.path.join(self.outdir, "not_a_data_dump.pickle")
+        with open(filename, "wb") as file:
+            pickle.dump(dict(a=1), file)
+        with self.assertRaises(TypeError):
+            bilby_pipe.utils.DataDump.from_pickle(filename)
+
 
 if __name__ == "__main__":
     unittest.main()